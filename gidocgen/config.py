@@ -1,13 +1,14 @@
 # SPDX-FileCopyrightText: 2021 GNOME Foundation <https://gnome.org>
 # SPDX-License-Identifier: Apache-2.0 OR GPL-3.0-or-later
 
+import functools
 import os
 import re
 
 toml_module = None
 try:
     import tomllib as toml_lib
-    toml_module = 'tomlib'
+    toml_module = 'tomllib'
 except ImportError:
     try:
         import tomli as toml_lib
@@ -27,10 +28,18 @@ class TomlConfig:
 
     @staticmethod
     def load(toml):
+        # The same configuration file can be loaded more than once in the
+        # same process; we key the cache on the modification time, so that
+        # changes to the file are still picked up
+        return TomlConfig._load_cached(toml, os.stat(toml).st_mtime_ns)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _load_cached(toml, mtime):
         log.debug(f"Using TOML module: {toml_module}")
         if toml_module is None:
             log.error("No toml module found")
-        elif toml_module in ['tomlib', 'tomli']:
+        elif toml_module in ['tomllib', 'tomli']:
             try:
                 with open(toml, "rb") as f:
                     return toml_lib.load(f)
@@ -45,6 +54,19 @@ class TomlConfig:
 
 class GIDocConfig:
     """Load and represent the configuration for gidocgen"""
+    __slots__ = (
+        '_favicons',
+        '_config_file',
+        '_config',
+        '_library',
+        '_extra',
+        '_theme',
+        '_check',
+        '_source_location',
+        '_objects',
+        '_object_matches',
+    )
+
     def __init__(self, config_file=None):
         self._favicons = []
         self._config_file = config_file
@@ -54,43 +76,56 @@ class GIDocConfig:
             log.debug(f"Reading configuration file: {self._config_file}")
             self._config = TomlConfig.load(self._config_file)
 
+        # The sections are accessed for every symbol while rendering the
+        # templates, so we look them up only once
+        self._library = self._config.get('library', {})
+        self._extra = self._config.get('extra', {})
+        self._theme = self._config.get('theme', {})
+        self._check = self._config.get('check', {})
+        self._source_location = self._config.get('source-location', {})
+        self._objects = self._config.get('object', {})
+
+        # The generator asks about the same symbols more than once, for
+        # their type's page and for their own; the answers never change
+        self._object_matches = {}
+
     @property
     def library(self):
-        return self._config.get('library', {})
+        return self._library
 
     @property
     def extra(self):
-        return self._config.get('extra', {})
+        return self._extra
 
     @property
     def theme(self):
-        return self._config.get('theme', {})
+        return self._theme
 
     @property
     def check(self):
-        return self._config.get('check', {})
+        return self._check
 
     def get_templates_dir(self, default=None):
-        return self.theme.get('templates_dir', default)
+        return self._theme.get('templates_dir', default)
 
     def get_theme_name(self, default=None):
-        return self.theme.get('name', default)
+        return self._theme.get('name', default)
 
     def get_library_name(self, default=None):
-        return self.library.get('name', default)
+        return self._library.get('name', default)
 
     def get_website_url(self, default=None):
-        return self.library.get('website_url', default)
+        return self._library.get('website_url', default)
 
     def get_logo_url(self, default=None):
-        return self.library.get('logo_url', default)
+        return self._library.get('logo_url', default)
 
     def get_description(self, default=None):
-        return self.library.get('description', default)
+        return self._library.get('description', default)
 
     @property
     def urlmap_file(self):
-        return self.extra.get('urlmap_file')
+        return self._extra.get('urlmap_file')
 
     @property
     def urlmap_basename(self):
@@ -100,35 +135,35 @@ class GIDocConfig:
 
     @property
     def version(self):
-        return self.library.get('version', 'Unknown')
+        return self._library.get('version', 'Unknown')
 
     @property
     def authors(self):
-        return self.library.get('authors', 'Unknown authors')
+        return self._library.get('authors', 'Unknown authors')
 
     @property
     def license(self):
-        return self.library.get('license', 'All rights reserved')
+        return self._library.get('license', 'All rights reserved')
 
     @property
     def website_url(self):
-        return self.library.get('website_url', '')
+        return self._library.get('website_url', '')
 
     @property
     def docs_url(self):
-        return self.library.get('docs_url', '')
+        return self._library.get('docs_url', '')
 
     @property
     def browse_url(self):
-        return self.library.get('browse_url', '')
+        return self._library.get('browse_url', '')
 
     @property
     def logo_url(self):
-        return self.library.get('logo_url', '')
+        return self._library.get('logo_url', '')
 
     @property
     def description(self):
-        return self.library.get('description', '')
+        return self._library.get('description', '')
 
     @property
     def dependencies(self):
@@ -168,47 +203,45 @@ class GIDocConfig:
 
     @property
     def devhelp(self):
-        return self.library.get('devhelp', False)
+        return self._library.get('devhelp', False)
 
     @property
     def search_index(self):
-        return self.library.get('search_index', False)
+        return self._library.get('search_index', False)
 
     @property
     def content_files(self):
-        return self.extra.get('content_files', [])
+        return self._extra.get('content_files', [])
 
     @property
     def content_images(self):
-        return self.extra.get('content_images', [])
+        return self._extra.get('content_images', [])
 
     @property
     def source_location_url(self):
-        source_location = self._config.get('source-location', {})
-        return source_location.get('base_url', '')
+        return self._source_location.get('base_url', '')
 
     @property
     def content_base_url(self):
-        return self.extra.get('content_base_url')
+        return self._extra.get('content_base_url')
 
     @property
     def file_format(self):
-        source_location = self._config.get('source-location', {})
-        return source_location.get('file_format', '{filename}#L{line}')
+        return self._source_location.get('file_format', '{filename}#L{line}')
 
     @property
     def theme_name(self):
-        return self.theme.get('name', '')
+        return self._theme.get('name', '')
 
     @property
     def show_index_summary(self):
-        return self.theme.get('show_index_summary', False)
+        return self._theme.get('show_index_summary', False)
 
     @property
     def show_class_hierarchy(self):
         if utils.find_program('dot') is None:
             return False
-        return self.theme.get('show_class_hierarchy', False)
+        return self._theme.get('show_class_hierarchy', False)
 
     def source_link(self, *args):
         (filename, line) = args[0]
@@ -224,9 +257,17 @@ class GIDocConfig:
 
     @property
     def objects(self):
-        return self._config.get('object', {})
+        return self._objects
 
     def match_object(self, name, match_key, category=None, key=None):
+        cache_key = (name, match_key, category, key)
+        res = self._object_matches.get(cache_key)
+        if res is None:
+            res = self._match_object(name, match_key, category, key)
+            self._object_matches[cache_key] = res
+        return res
+
+    def _match_object(self, name, match_key, category=None, key=None):
         def obj_matches(obj, name):
             n = obj.get('name')
             p = obj.get('pattern')
@@ -260,7 +301,7 @@ class GIDocConfig:
     def is_unstable(self, version):
         if not version:
             return False
-        cur_version = self.library.get('version')
+        cur_version = self._library.get('version')
         if cur_version is None:
             return False
 
@@ -283,11 +324,19 @@ class GIDocConfig:
 
     @property
     def ignore_deprecated(self):
-        return self.check.get('ignore_deprecated', False)
+        return self._check.get('ignore_deprecated', False)
 
 
 class GITemplateConfig:
     """Load and represent the template configuration"""
+    __slots__ = (
+        '_templates_dir',
+        '_template_name',
+        '_config_file',
+        '_config',
+        '_templates',
+    )
+
     def __init__(self, templates_dir, template_name):
         self._templates_dir = templates_dir
         self._template_name = template_name
@@ -297,6 +346,8 @@ class GITemplateConfig:
         log.debug(f"Reading template configuration file: {self._config_file}")
         self._config = TomlConfig.load(self._config_file)
 
+        self._templates = self._config.get('templates', {})
+
     @property
     def name(self):
         metadata = self._config.get('metadata', {})
@@ -314,80 +365,80 @@ class GITemplateConfig:
 
     @property
     def templates(self):
-        return self._config.get('templates', {})
+        return self._templates
 
     @property
     def class_template(self):
-        return self.templates.get('class', 'class.html')
+        return self._templates.get('class', 'class.html')
 
     @property
     def method_template(self):
-        return self.templates.get('method', 'method.html')
+        return self._templates.get('method', 'method.html')
 
     @property
     def class_method_template(self):
-        return self.templates.get('class_method', 'class_method.html')
+        return self._templates.get('class_method', 'class_method.html')
 
     @property
     def vfunc_template(self):
-        return self.templates.get('vfunc', 'vfunc.html')
+        return self._templates.get('vfunc', 'vfunc.html')
 
     @property
     def property_template(self):
-        return self.templates.get('property', 'property.html')
+        return self._templates.get('property', 'property.html')
 
     @property
     def signal_template(self):
-        return self.templates.get('signal', 'signal.html')
+        return self._templates.get('signal', 'signal.html')
 
     @property
     def type_func_template(self):
-        return self.templates.get('type_func', 'type_func.html')
+        return self._templates.get('type_func', 'type_func.html')
 
     @property
     def ctor_template(self):
-        return self.templates.get('ctor', 'type_func.html')
+        return self._templates.get('ctor', 'type_func.html')
 
     @property
     def func_template(self):
-        return self.templates.get('function', 'function.html')
+        return self._templates.get('function', 'function.html')
 
     @property
     def constant_template(self):
-        return self.templates.get('constant', 'constant.html')
+        return self._templates.get('constant', 'constant.html')
 
     @property
     def interface_template(self):
-        return self.templates.get('interface', 'interface.html')
+        return self._templates.get('interface', 'interface.html')
 
     @property
     def namespace_template(self):
-        return self.templates.get('namespace', 'namespace.html')
+        return self._templates.get('namespace', 'namespace.html')
 
     @property
     def content_template(self):
-        return self.templates.get('content', 'content.html')
+        return self._templates.get('content', 'content.html')
 
     @property
     def enum_template(self):
-        return self.templates.get('enum', 'enum.html')
+        return self._templates.get('enum', 'enum.html')
 
     @property
     def flags_template(self):
-        return self.templates.get('flags', 'flags.html')
+        return self._templates.get('flags', 'flags.html')
 
     @property
     def error_template(self):
-        return self.templates.get('error', 'error.html')
+        return self._templates.get('error', 'error.html')
 
     @property
     def record_template(self):
-        return self.templates.get('record', 'record.html')
+        return self._templates.get('record', 'record.html')
 
     @property
     def union_template(self):
-        return self.templates.get('union', 'union.html')
+        return self._templates.get('union', 'union.html')
 
     @property
     def alias_template(self):
-        return self.templates.get('alias', 'alias.html')
+        return self._templates.get('alias', 'alias.html')
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0 OR GPL-3.0-or-later
 
 import argparse
+import concurrent.futures
 import sys
 
 from . import config, gir, log, utils
@@ -9,41 +10,73 @@ from . import config, gir, log, utils
 
 HELP_MSG = "Checks introspection data for valid documentation"
 
+# The results of the checks are stored as tuples, and only formatted
+# when reporting them, using the template for their kind
+RESULT_MESSAGES = {
+    "symbol": "Symbol '{}.{}' at {}:{} is not documented",
+    "parameter": "Parameter '{}' of symbol '{}' is not documented",
+    "return-value": "Return value for symbol '{}' is not documented",
+}
 
-def _check_doc_element(path, symbol, results):
-    name = '.'.join(path + [symbol.name])
 
-    if symbol.source_position is not None:
-        filename = symbol.source_position[0]
-        line = symbol.source_position[1]
+def _name_lower(symbol):
+    return symbol.name.lower()
+
+
+def _check_doc_element(prefix, symbol, results):
+    # Most symbols are documented, so bail out before doing any work
+    if symbol.doc is not None:
+        return
+
+    source_position = symbol.source_position
+    if source_position is not None:
+        filename, line = source_position
     else:
         filename = "<unknown>"
         line = 0
 
-    if symbol.doc is None:
-        results.append(f"Symbol '{name}' at {filename}:{line} is not documented")
+    results.append(("symbol", prefix, symbol.name, filename, line))
 
 
-def _check_arg_docs(path, arguments, results):
-    symbol = '.'.join(path)
+def _check_arg_docs(symbol, arguments, results):
     for arg in arguments:
         if arg.doc is None:
-            results.append(f"Parameter '{arg.name}' of symbol '{symbol}' is not documented")
+            results.append(("parameter", arg.name, symbol))
 
 
-def _check_retval_docs(path, retval, results):
-    if retval is None:
+def _check_retval_docs(symbol, retval, results):
+    if retval is None or retval.doc is not None:
         return
 
     if isinstance(retval.target, gir.VoidType):
         return
 
-    symbol = '.'.join(path)
-    if retval.doc is None:
-        results.append(f"Return value for symbol '{symbol}' is not documented")
+    results.append(("return-value", symbol))
+
+
+def _check_callables(config, type_name, prefix, kind, callables, results):
+    for func in callables:
+        if config.ignore_deprecated and func.deprecated:
+            continue
+        if config.is_skipped(type_name, kind, func.name):
+            continue
+        _check_doc_element(prefix, func, results)
+        symbol = f"{prefix}.{func.name}"
+        _check_arg_docs(symbol, func.parameters, results)
+        _check_retval_docs(symbol, func.return_value, results)
+
+
+def _check_properties(config, type_name, prefix, properties, results):
+    for prop in properties:
+        if config.ignore_deprecated and prop.deprecated:
+            continue
+        if config.is_skipped(type_name, 'property', prop.name):
+            continue
+        _check_doc_element(prefix, prop, results)
 
 
 def _check_aliases(config, repository, symbols, results):
+    ns = repository.namespace.name
     for alias in symbols:
         if config.ignore_deprecated and alias.deprecated:
             log.debug(f"Skipping deprecated alias {alias.name}")
@@ -51,10 +84,11 @@ def _check_aliases(config, repository, symbols, results):
         if config.is_skipped(alias.name):
             log.debug(f"Skipping hidden alias {alias.name}")
             continue
-        _check_doc_element([repository.namespace.name], alias, results)
+        _check_doc_element(ns, alias, results)
 
 
 def _check_bitfields(config, repository, symbols, results):
+    ns = repository.namespace.name
     for bitfield in symbols:
         if config.ignore_deprecated and bitfield.deprecated:
             log.debug(f"Skipping deprecated bitfield {bitfield.name}")
@@ -63,22 +97,18 @@ def _check_bitfields(config, repository, symbols, results):
             log.debug(f"Skipping hidden bitfield {bitfield.name}")
             continue
 
-        _check_doc_element([repository.namespace.name], bitfield, results)
+        _check_doc_element(ns, bitfield, results)
+
+        bitfield_prefix = f"{ns}.{bitfield.name}"
 
         for member in bitfield.members:
-            _check_doc_element([repository.namespace.name, bitfield.name], member, results)
+            _check_doc_element(bitfield_prefix, member, results)
 
-        for func in bitfield.functions:
-            if config.ignore_deprecated and func.deprecated:
-                continue
-            if config.is_skipped(bitfield.name, 'function', func.name):
-                continue
-            _check_doc_element([repository.namespace.name, bitfield.name], func, results)
-            _check_arg_docs([repository.namespace.name, bitfield.name, func.name], func.parameters, results)
-            _check_retval_docs([repository.namespace.name, bitfield.name, func.name], func.return_value, results)
+        _check_callables(config, bitfield.name, bitfield_prefix, 'function', bitfield.functions, results)
 
 
 def _check_callbacks(config, repository, symbols, results):
+    ns = repository.namespace.name
     for cb in symbols:
         if config.ignore_deprecated and cb.deprecated:
             log.debug(f"Skipping deprecated callback {cb.name}")
@@ -87,12 +117,14 @@ def _check_callbacks(config, repository, symbols, results):
             log.debug(f"Skipping hidden callback {cb.name}")
             continue
 
-        _check_doc_element([repository.namespace.name], cb, results)
-        _check_arg_docs([repository.namespace.name, cb.name], cb.parameters, results)
-        _check_retval_docs([repository.namespace.name, cb.name], cb.return_value, results)
+        _check_doc_element(ns, cb, results)
+        symbol = f"{ns}.{cb.name}"
+        _check_arg_docs(symbol, cb.parameters, results)
+        _check_retval_docs(symbol, cb.return_value, results)
 
 
 def _check_classes(config, repository, symbols, results):
+    ns = repository.namespace.name
     for cls in symbols:
         if config.ignore_deprecated and cls.deprecated:
             log.debug(f"Skipping deprecated class {cls.name}")
@@ -101,53 +133,19 @@ def _check_classes(config, repository, symbols, results):
             log.debug(f"Skipping hidden class {cls.name}")
             continue
 
-        _check_doc_element([repository.namespace.name], cls, results)
-
-        for ctor in cls.constructors:
-            if config.ignore_deprecated and ctor.deprecated:
-                continue
-            if config.is_skipped(cls.name, 'constructor', ctor.name):
-                continue
-            _check_doc_element([repository.namespace.name, cls.name], ctor, results)
-            _check_arg_docs([repository.namespace.name, cls.name, ctor.name], ctor.parameters, results)
-            _check_retval_docs([repository.namespace.name, cls.name, ctor.name], ctor.return_value, results)
-
-        for method in cls.methods:
-            if config.ignore_deprecated and method.deprecated:
-                continue
-            if config.is_skipped(cls.name, 'method', method.name):
-                continue
-            _check_doc_element([repository.namespace.name, cls.name], method, results)
-            _check_arg_docs([repository.namespace.name, cls.name, method.name], method.parameters, results)
-            _check_retval_docs([repository.namespace.name, cls.name, method.name], method.return_value, results)
-
-        for func in cls.functions:
-            if config.ignore_deprecated and func.deprecated:
-                continue
-            if config.is_skipped(cls.name, 'function', func.name):
-                continue
-            _check_doc_element([repository.namespace.name, cls.name], func, results)
-            _check_arg_docs([repository.namespace.name, cls.name, func.name], func.parameters, results)
-            _check_retval_docs([repository.namespace.name, cls.name, func.name], func.return_value, results)
-
-        for prop in cls.properties.values():
-            if config.ignore_deprecated and prop.deprecated:
-                continue
-            if config.is_skipped(cls.name, 'property', prop.name):
-                continue
-            _check_doc_element([repository.namespace.name, cls.name], prop, results)
-
-        for signal in cls.signals.values():
-            if config.ignore_deprecated and signal.deprecated:
-                continue
-            if config.is_skipped(cls.name, 'signal', signal.name):
-                continue
-            _check_doc_element([repository.namespace.name, cls.name], signal, results)
-            _check_arg_docs([repository.namespace.name, cls.name, signal.name], signal.parameters, results)
-            _check_retval_docs([repository.namespace.name, cls.name, signal.name], signal.return_value, results)
+        _check_doc_element(ns, cls, results)
+
+        cls_prefix = f"{ns}.{cls.name}"
+
+        _check_callables(config, cls.name, cls_prefix, 'constructor', cls.constructors, results)
+        _check_callables(config, cls.name, cls_prefix, 'method', cls.methods, results)
+        _check_callables(config, cls.name, cls_prefix, 'function', cls.functions, results)
+        _check_properties(config, cls.name, cls_prefix, cls.properties.values(), results)
+        _check_callables(config, cls.name, cls_prefix, 'signal', cls.signals.values(), results)
 
 
 def _check_constants(config, repository, symbols, results):
+    ns = repository.namespace.name
     for constant in symbols:
         if config.ignore_deprecated and constant.deprecated:
             log.debug(f"Skipping deprecated constant {constant.name}")
@@ -156,10 +154,11 @@ def _check_constants(config, repository, symbols, results):
             log.debug(f"Skipping hidden constant {constant.name}")
             continue
 
-        _check_doc_element([repository.namespace.name], constant, results)
+        _check_doc_element(ns, constant, results)
 
 
 def _check_domains(config, repository, symbols, results):
+    ns = repository.namespace.name
     for domain in symbols:
         if config.ignore_deprecated and domain.deprecated:
             log.debug(f"Skipping deprecated error domain {domain.name}")
@@ -168,22 +167,18 @@ def _check_domains(config, repository, symbols, results):
             log.debug(f"Skipping hidden error domain {domain.name}")
             continue
 
-        _check_doc_element([repository.namespace.name], domain, results)
+        _check_doc_element(ns, domain, results)
+
+        domain_prefix = f"{ns}.{domain.name}"
 
         for member in domain.members:
-            _check_doc_element([repository.namespace.name, domain.name], member, results)
+            _check_doc_element(domain_prefix, member, results)
 
-        for func in domain.functions:
-            if config.ignore_deprecated and func.deprecated:
-                continue
-            if config.is_skipped(domain.name, 'function', func.name):
-                continue
-            _check_doc_element([repository.namespace.name, domain.name], func, results)
-            _check_arg_docs([repository.namespace.name, domain.name, func.name], func.parameters, results)
-            _check_retval_docs([repository.namespace.name, domain.name, func.name], func.return_value, results)
+        _check_callables(config, domain.name, domain_prefix, 'function', domain.functions, results)
 
 
 def _check_enums(config, repository, symbols, results):
+    ns = repository.namespace.name
     for enum in symbols:
         if config.ignore_deprecated and enum.deprecated:
             log.debug(f"Skipping deprecated enumeration {enum.name}")
@@ -192,22 +187,18 @@ def _check_enums(config, repository, symbols, results):
             log.debug(f"Skipping hidden enumeration {enum.name}")
             continue
 
-        _check_doc_element([repository.namespace.name], enum, results)
+        _check_doc_element(ns, enum, results)
+
+        enum_prefix = f"{ns}.{enum.name}"
 
         for member in enum.members:
-            _check_doc_element([repository.namespace.name, enum.name], member, results)
+            _check_doc_element(enum_prefix, member, results)
 
-        for func in enum.functions:
-            if config.ignore_deprecated and func.deprecated:
-                continue
-            if config.is_skipped(enum.name, 'function', func.name):
-                continue
-            _check_doc_element([repository.namespace.name, enum.name], func, results)
-            _check_arg_docs([repository.namespace.name, enum.name, func.name], func.parameters, results)
-            _check_retval_docs([repository.namespace.name, enum.name, func.name], func.return_value, results)
+        _check_callables(config, enum.name, enum_prefix, 'function', enum.functions, results)
 
 
 def _check_functions(config, repository, symbols, results):
+    ns = repository.namespace.name
     for func in symbols:
         if config.ignore_deprecated and func.deprecated:
             log.debug(f"Skipping deprecated function {func.name}")
@@ -216,12 +207,14 @@ def _check_functions(config, repository, symbols, results):
             log.debug(f"Skipping hidden function {func.name}")
             continue
 
-        _check_doc_element([repository.namespace.name], func, results)
-        _check_arg_docs([repository.namespace.name, func.name], func.parameters, results)
-        _check_retval_docs([repository.namespace.name, func.name], func.return_value, results)
+        _check_doc_element(ns, func, results)
+        symbol = f"{ns}.{func.name}"
+        _check_arg_docs(symbol, func.parameters, results)
+        _check_retval_docs(symbol, func.return_value, results)
 
 
 def _check_function_macros(config, repository, symbols, results):
+    ns = repository.namespace.name
     for func in symbols:
         if config.ignore_deprecated and func.deprecated:
             log.debug(f"Skipping deprecated function macro {func.name}")
@@ -230,12 +223,14 @@ def _check_function_macros(config, repository, symbols, results):
             log.debug(f"Skipping hidden function macro {func.name}")
             continue
 
-        _check_doc_element([repository.namespace.name], func, results)
-        _check_arg_docs([repository.namespace.name, func.name], func.parameters, results)
-        _check_retval_docs([repository.namespace.name, func.name], func.return_value, results)
+        _check_doc_element(ns, func, results)
+        symbol = f"{ns}.{func.name}"
+        _check_arg_docs(symbol, func.parameters, results)
+        _check_retval_docs(symbol, func.return_value, results)
 
 
 def _check_interfaces(config, repository, symbols, results):
+    ns = repository.namespace.name
     for iface in symbols:
         if config.ignore_deprecated and iface.deprecated:
             log.debug(f"Skipping deprecated interface {iface.name}")
@@ -244,44 +239,18 @@ def _check_interfaces(config, repository, symbols, results):
             log.debug(f"Skipping hidden interface {iface.name}")
             continue
 
-        _check_doc_element([repository.namespace.name], iface, results)
-
-        for method in iface.methods:
-            if config.ignore_deprecated and method.deprecated:
-                continue
-            if config.is_skipped(iface.name, 'method', method.name):
-                continue
-            _check_doc_element([repository.namespace.name, iface.name], method, results)
-            _check_arg_docs([repository.namespace.name, iface.name, method.name], method.parameters, results)
-            _check_retval_docs([repository.namespace.name, iface.name, method.name], method.return_value, results)
-
-        for func in iface.functions:
-            if config.ignore_deprecated and func.deprecated:
-                continue
-            if config.is_skipped(iface.name, 'function', func.name):
-                continue
-            _check_doc_element([repository.namespace.name, iface.name], func, results)
-            _check_arg_docs([repository.namespace.name, iface.name, func.name], func.parameters, results)
-            _check_retval_docs([repository.namespace.name, iface.name, func.name], func.return_value, results)
-
-        for prop in iface.properties.values():
-            if config.ignore_deprecated and prop.deprecated:
-                continue
-            if config.is_skipped(iface.name, 'property', prop.name):
-                continue
-            _check_doc_element([repository.namespace.name, iface.name], prop, results)
-
-        for signal in iface.signals.values():
-            if config.ignore_deprecated and signal.deprecated:
-                continue
-            if config.is_skipped(iface.name, 'signal', signal.name):
-                continue
-            _check_doc_element([repository.namespace.name, iface.name], signal, results)
-            _check_arg_docs([repository.namespace.name, iface.name, signal.name], signal.parameters, results)
-            _check_retval_docs([repository.namespace.name, iface.name, signal.name], signal.return_value, results)
+        _check_doc_element(ns, iface, results)
+
+        iface_prefix = f"{ns}.{iface.name}"
+
+        _check_callables(config, iface.name, iface_prefix, 'method', iface.methods, results)
+        _check_callables(config, iface.name, iface_prefix, 'function', iface.functions, results)
+        _check_properties(config, iface.name, iface_prefix, iface.properties.values(), results)
+        _check_callables(config, iface.name, iface_prefix, 'signal', iface.signals.values(), results)
 
 
 def _check_records(config, repository, symbols, results):
+    ns = repository.namespace.name
     for struct in symbols:
         if config.ignore_deprecated and struct.deprecated:
             log.debug(f"Skipping deprecated record {struct.name}")
@@ -290,37 +259,17 @@ def _check_records(config, repository, symbols, results):
             log.debug(f"Skipping hidden record {struct.name}")
             continue
 
-        _check_doc_element([repository.namespace.name], struct, results)
-
-        for ctor in struct.constructors:
-            if config.ignore_deprecated and ctor.deprecated:
-                continue
-            if config.is_skipped(struct.name, 'constructor', ctor.name):
-                continue
-            _check_doc_element([repository.namespace.name, struct.name], ctor, results)
-            _check_arg_docs([repository.namespace.name, struct.name, ctor.name], ctor.parameters, results)
-            _check_retval_docs([repository.namespace.name, struct.name, ctor.name], ctor.return_value, results)
-
-        for method in struct.methods:
-            if config.ignore_deprecated and method.deprecated:
-                continue
-            if config.is_skipped(struct.name, 'method', method.name):
-                continue
-            _check_doc_element([repository.namespace.name, struct.name], method, results)
-            _check_arg_docs([repository.namespace.name, struct.name, method.name], method.parameters, results)
-            _check_retval_docs([repository.namespace.name, struct.name, method.name], method.return_value, results)
-
-        for func in struct.functions:
-            if config.ignore_deprecated and func.deprecated:
-                continue
-            if config.is_skipped(struct.name, 'function', func.name):
-                continue
-            _check_doc_element([repository.namespace.name, struct.name], func, results)
-            _check_arg_docs([repository.namespace.name, struct.name, func.name], func.parameters, results)
-            _check_retval_docs([repository.namespace.name, struct.name, func.name], func.return_value, results)
+        _check_doc_element(ns, struct, results)
+
+        struct_prefix = f"{ns}.{struct.name}"
+
+        _check_callables(config, struct.name, struct_prefix, 'constructor', struct.constructors, results)
+        _check_callables(config, struct.name, struct_prefix, 'method', struct.methods, results)
+        _check_callables(config, struct.name, struct_prefix, 'function', struct.functions, results)
 
 
 def _check_unions(config, repository, symbols, results):
+    ns = repository.namespace.name
     for union in symbols:
         if config.ignore_deprecated and union.deprecated:
             log.debug(f"Skipping deprecated union {union.name}")
@@ -329,88 +278,55 @@ def _check_unions(config, repository, symbols, results):
             log.debug(f"Skipping hidden union {union.name}")
             continue
 
-        _check_doc_element([repository.namespace.name], union, results)
-
-        for ctor in union.constructors:
-            if config.ignore_deprecated and ctor.deprecated:
-                continue
-            if config.is_skipped(union.name, 'constructor', ctor.name):
-                continue
-            _check_doc_element([repository.namespace.name, union.name], ctor, results)
-            _check_arg_docs([repository.namespace.name, union.name, ctor.name], ctor.parameters, results)
-            _check_retval_docs([repository.namespace.name, union.name, ctor.name], ctor.return_value, results)
-
-        for method in union.methods:
-            if config.ignore_deprecated and method.deprecated:
-                continue
-            if config.is_skipped(union.name, 'method', method.name):
-                continue
-            _check_doc_element([repository.namespace.name, union.name], method, results)
-            _check_arg_docs([repository.namespace.name, union.name, method.name], method.parameters, results)
-            _check_retval_docs([repository.namespace.name, union.name, method.name], method.return_value, results)
-
-        for func in union.functions:
-            if config.ignore_deprecated and func.deprecated:
-                continue
-            if config.is_skipped(union.name, 'function', func.name):
-                continue
-            _check_doc_element([repository.namespace.name, union.name], func, results)
-            _check_arg_docs([repository.namespace.name, union.name, func.name], func.parameters, results)
-            _check_retval_docs([repository.namespace.name, union.name, func.name], func.return_value, results)
+        _check_doc_element(ns, union, results)
+
+        union_prefix = f"{ns}.{union.name}"
+
+        _check_callables(config, union.name, union_prefix, 'constructor', union.constructors, results)
+        _check_callables(config, union.name, union_prefix, 'method', union.methods, results)
+        _check_callables(config, union.name, union_prefix, 'function', union.functions, results)
+
+
+# Each section is a tuple of: name, Namespace getter, checker
+SECTIONS = (
+    ("aliases", "get_aliases", _check_aliases),
+    ("bitfields", "get_bitfields", _check_bitfields),
+    ("callbacks", "get_callbacks", _check_callbacks),
+    ("classes", "get_classes", _check_classes),
+    ("constants", "get_constants", _check_constants),
+    ("domains", "get_error_domains", _check_domains),
+    ("enums", "get_enumerations", _check_enums),
+    ("functions", "get_functions", _check_functions),
+    ("function_macros", "get_effective_function_macros", _check_function_macros),
+    ("interfaces", "get_interfaces", _check_interfaces),
+    ("structs", "get_effective_records", _check_records),
+    ("unions", "get_unions", _check_unions),
+)
 
 
 def check(repository, config):
     namespace = repository.namespace
 
-    symbols = {
-        "aliases": sorted(namespace.get_aliases(), key=lambda alias: alias.name.lower()),
-        "bitfields": sorted(namespace.get_bitfields(), key=lambda bitfield: bitfield.name.lower()),
-        "callbacks": sorted(namespace.get_callbacks(), key=lambda callback: callback.name.lower()),
-        "classes": sorted(namespace.get_classes(), key=lambda cls: cls.name.lower()),
-        "constants": sorted(namespace.get_constants(), key=lambda const: const.name.lower()),
-        "domains": sorted(namespace.get_error_domains(), key=lambda domain: domain.name.lower()),
-        "enums": sorted(namespace.get_enumerations(), key=lambda enum: enum.name.lower()),
-        "functions": sorted(namespace.get_functions(), key=lambda func: func.name.lower()),
-        "function_macros": sorted(namespace.get_effective_function_macros(), key=lambda func: func.name.lower()),
-        "interfaces": sorted(namespace.get_interfaces(), key=lambda interface: interface.name.lower()),
-        "structs": sorted(namespace.get_effective_records(), key=lambda record: record.name.lower()),
-        "unions": sorted(namespace.get_unions(), key=lambda union: union.name.lower()),
-    }
-
-    all_indices = {
-        "aliases": _check_aliases,
-        "bitfields": _check_bitfields,
-        "callbacks": _check_callbacks,
-        "classes": _check_classes,
-        "constants": _check_constants,
-        "domains": _check_domains,
-        "enums": _check_enums,
-        "functions": _check_functions,
-        "function_macros": _check_function_macros,
-        "interfaces": _check_interfaces,
-        "structs": _check_records,
-        "unions": _check_unions,
-    }
+    def check_section(section, getter, checker):
+        log.debug(f"Checking symbols for section {section}")
+        symbols = sorted(getattr(namespace, getter)(), key=_name_lower)
+        section_results = []
+        checker(config, repository, symbols, section_results)
+        return section_results
 
     results = []
 
     # Each section is isolated, so we run it into a thread pool
-    for section in all_indices:
-        checker = all_indices.get(section, None)
-        if checker is None:
-            log.error(f"No checker for section {section}")
-            continue
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        futures = [executor.submit(check_section, *section) for section in SECTIONS]
 
-        s = symbols.get(section, None)
-        if s is None:
-            log.debug(f"No symbols for section {section}")
-            continue
-
-        log.debug(f"Checking symbols for section {section}")
-        checker(config, repository, s, results)
+        # Collect the results in submission order, to keep the output
+        # reproducible across runs
+        for future in futures:
+            results.extend(future.result())
 
-    for res in results:
-        log.warning(res)
+    if results:
+        log.warnings([RESULT_MESSAGES[kind].format(*args) for (kind, *args) in results])
 
     if len(results) == 0:
         return 0
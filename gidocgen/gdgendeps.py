@@ -5,7 +5,7 @@ import argparse
 import os
 import sys
 
-from . import config, gir, log, utils
+from . import config, log, utils
 
 
 HELP_MSG = "Generates the build dependencies"
@@ -26,33 +26,25 @@ def _gen_content_images(config, content_dirs):
 
 
 def gen_dependencies(repository, config, options):
-    outfile = options.outfile
-
-    outfile.write(options.config)
-    outfile.write("\n")
+    lines = [options.config]
 
     for name in repository.includes:
         include = repository.includes[name]
         if include.girfile is not None:
-            outfile.write(include.girfile)
-            outfile.write("\n")
+            lines.append(include.girfile)
 
-    outfile.write(repository.girfile)
-    outfile.write("\n")
+    lines.append(repository.girfile)
 
     content_dirs = options.content_dirs
     if content_dirs == []:
         content_dirs = [os.getcwd()]
 
-    content_files = _gen_content_files(config, content_dirs)
-    for f in content_files:
-        outfile.write(f)
-        outfile.write("\n")
+    lines.extend(_gen_content_files(config, content_dirs))
+    lines.extend(_gen_content_images(config, content_dirs))
 
-    content_images = _gen_content_images(config, content_dirs)
-    for f in content_images:
-        outfile.write(f)
-        outfile.write("\n")
+    # Write everything in one go, instead of two writes per dependency
+    lines.append("")
+    options.outfile.write("\n".join(lines))
 
 
 def add_args(parser):
@@ -69,6 +61,9 @@ def add_args(parser):
 
 
 def run(options):
+    # The GIR parser is only needed when running the command
+    from . import gir
+
     # If we're sending output to stdout, we disable logging
     if options.outfile.name == "<stdout>":
         log.set_quiet(True)
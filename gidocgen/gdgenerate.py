@@ -2,12 +2,14 @@
 # SPDX-License-Identifier: Apache-2.0 OR GPL-3.0-or-later
 
 import argparse
+import collections
 import concurrent.futures
+import functools
 import jinja2
-import markdown
 import os
 import shutil
 import sys
+import typing as T
 
 import xml.etree.ElementTree as etree
 
@@ -25,9 +27,24 @@ class CallableType:
     SIGNAL = 4
 
 
+# Where the documentation of a symbol, or the symbol itself, is defined
+DocsLocation = collections.namedtuple('DocsLocation', ['filename', 'line'])
+
+# The version in which a symbol was deprecated, and the optional message
+DeprecationInfo = collections.namedtuple('DeprecationInfo', ['version', 'message'])
+
+# A type listed by another one, like the descendants of a class
+TypeRef = collections.namedtuple('TypeRef', ['name', 'ctype'])
+
 HELP_MSG = "Generates the reference"
 
 MISSING_DESCRIPTION = "No description available."
+MISSING_DESCRIPTION_MARKUP = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+
+# The pages of classes, interfaces, records and unions, and the pages of
+# their symbols, are the largest files we write; a bigger buffer lets the
+# whole page go out in a single write
+PAGE_BUFFER_SIZE = 256 * 1024
 
 STRING_TYPES = {
     'utf8': 'The value is a NUL terminated UTF-8 string.',
@@ -39,6 +56,10 @@ STRING_ELEMENT_TYPES = {
     'filename': 'Each element is a platform-native string, using the preferred OS encoding on Unix and UTF-8 on Windows..',
 }
 
+# The GIR names of the string and list model types
+STRING_TYPE_NAMES = frozenset(STRING_TYPES)
+LIST_MODEL_TYPE_NAMES = frozenset(['Gio.ListModel', 'GListModel'])
+
 IN_ARG_TRANSFER_MODES = {
     CallableType.CALLBACK: {
         'none': 'The data is owned by the caller of the function.',
@@ -95,6 +116,15 @@ OUT_ARG_TRANSFER_MODES = {
     },
 }
 
+# The argument transfer modes above, flattened and keyed on whether the
+# argument is an output, the callable type, and the transfer mode
+ARG_TRANSFER_NOTES = {
+    (is_out, callable_type, transfer): note
+    for is_out, modes in ((False, IN_ARG_TRANSFER_MODES), (True, OUT_ARG_TRANSFER_MODES))
+    for callable_type, notes in modes.items()
+    for transfer, note in notes.items()
+}
+
 RETURN_TRANSFER_MODES = {
     CallableType.CALLBACK: {
         'none': 'The data is owned by the called function.',
@@ -163,7 +193,22 @@ FRAGMENT = {
     "unions": "union",
 }
 
+# The page fragment for each type; gen_type_link() looks up the exact class
+# of the type, so subclasses like BitField need their own entry
+TYPE_LINK_FRAGMENTS = {
+    gir.Alias: "alias",
+    gir.BitField: "flags",
+    gir.Callback: "callback",
+    gir.Class: "class",
+    gir.ErrorDomain: "error",
+    gir.Enumeration: "enum",
+    gir.Interface: "iface",
+    gir.Record: "struct",
+    gir.Union: "union",
+}
+
 
+@functools.lru_cache(maxsize=None)
 def type_name_to_cname(fqtn, is_pointer=False):
     res = []
     try:
@@ -177,94 +222,73 @@ def type_name_to_cname(fqtn, is_pointer=False):
     return "".join(res)
 
 
+def _strip_parent_dirs(filename):
+    # Source paths are relative to the build directory; drop the leading
+    # "../" components, but leave the rest of the path alone
+    while filename.startswith('../'):
+        filename = filename[3:]
+    return filename
+
+
 def transfer_note(transfer, direction, method=CallableType.FUNCTION):
-    if direction in ['out', 'inout']:
-        mode = OUT_ARG_TRANSFER_MODES[method]
-    else:
-        mode = IN_ARG_TRANSFER_MODES[method]
-    return mode.get(transfer)
+    return ARG_TRANSFER_NOTES.get((direction in ('out', 'inout'), method, transfer))
 
 
-def gen_index_func(func, namespace, md=None):
-    """Generates a dictionary with the callable metadata required by an index template"""
-    name = func.name
-    if getattr(func, "identifier"):
-        identifier = func.identifier
-    else:
-        identifier = None
-    if func.doc is not None:
-        summary = utils.preprocess_docs(func.doc.content, namespace, summary=True, md=md)
+def _gen_index_member(member, namespace, md=None):
+    """Generates a dictionary with the member metadata required by an index template"""
+    if member.doc is not None:
+        summary = utils.preprocess_docs(member.doc.content, namespace, summary=True, md=md)
     else:
         summary = MISSING_DESCRIPTION
-    if func.available_since is not None:
-        available_since = func.available_since
-    else:
-        available_since = None
-    if func.deprecated:
-        (version, msg) = func.deprecated_since
+    if member.deprecated:
+        (version, msg) = member.deprecated_since
         deprecated_since = version
     else:
         deprecated_since = None
     return {
-        "name": name,
-        "identifier": identifier,
+        "name": member.name,
         "summary": summary,
-        "available_since": available_since,
+        "available_since": member.available_since,
         "deprecated_since": deprecated_since,
     }
 
 
-def gen_index_property(prop, namespace, md=None):
-    name = prop.name
-    if prop.doc is not None:
-        summary = utils.preprocess_docs(prop.doc.content, namespace, summary=True, md=md)
-    else:
-        summary = MISSING_DESCRIPTION
-    if prop.available_since is not None:
-        available_since = prop.available_since
-    else:
-        available_since = None
-    if prop.deprecated:
-        (version, msg) = prop.deprecated_since
-        deprecated_since = version
-    else:
-        deprecated_since = None
-    return {
-        "name": name,
-        "summary": summary,
-        "available_since": available_since,
-        "deprecated_since": deprecated_since,
-    }
+def gen_index_func(func, namespace, md=None):
+    """Generates a dictionary with the callable metadata required by an index template"""
+    res = _gen_index_member(func, namespace, md)
+    res["identifier"] = func.identifier or None
+    return res
 
 
-def gen_index_signal(signal, namespace, md=None):
-    name = signal.name
-    if signal.doc is not None:
-        summary = utils.preprocess_docs(signal.doc.content, namespace, summary=True, md=md)
-    else:
-        summary = MISSING_DESCRIPTION
-    if signal.available_since is not None:
-        available_since = signal.available_since
-    else:
-        available_since = None
-    if signal.deprecated:
-        (version, msg) = signal.deprecated_since
-        deprecated_since = version
-    else:
-        deprecated_since = None
-    return {
-        "name": name,
-        "summary": summary,
-        "available_since": available_since,
-        "deprecated_since": deprecated_since,
-    }
+# Properties and signals only have the common member metadata
+gen_index_property = _gen_index_member
+gen_index_signal = _gen_index_member
+
+
+# Base classes and common interfaces appear in the index of many types,
+# so we generate each entry only once per run; the entries are never
+# modified after being generated.
+#
+# The entries depend on the configuration, through config.is_hidden(), but
+# the configuration is not part of the key: both caches are only valid for
+# a single gen_reference() call, which clears them once all the sections
+# have been generated
+_index_ancestors: T.Dict[T.Tuple[str, T.Optional[str], str], T.Dict[str, T.Any]] = {}
+_index_implements: T.Dict[T.Tuple[str, T.Optional[str], str], T.Dict[str, T.Any]] = {}
 
 
 def gen_index_ancestor(ancestor_type, namespace, config, md=None):
-    ancestor_name = ancestor_type.name
-    if '.' in ancestor_name:
-        ns, ancestor_name = ancestor_name.split('.')
-    else:
+    cache_key = (ancestor_type.name, ancestor_type.namespace, namespace.name)
+    res = _index_ancestors.get(cache_key)
+    if res is None:
+        res = _gen_index_ancestor(ancestor_type, namespace, config, md)
+        _index_ancestors[cache_key] = res
+    return res
+
+
+def _gen_index_ancestor(ancestor_type, namespace, config, md=None):
+    ns, _, ancestor_name = ancestor_type.name.rpartition('.')
+    if not ns:
         ns = ancestor_type.namespace or namespace.name
     res = namespace.repository.find_class(ancestor_name, ns)
     if res is not None:
@@ -288,14 +312,10 @@ def gen_index_ancestor(ancestor_type, namespace, config, md=None):
     if ancestor is not None:
         # Set a hard-limit on the number of methods; base types can
         # add *a lot* of them; two dozens feel like a good compromise
-        for m in ancestor.methods:
-            is_hidden = config.is_hidden(ancestor_name, "method", m.name)
-            if not is_hidden:
-                n_methods += 1
+        visible_methods = [m for m in ancestor.methods if not config.is_hidden(ancestor_name, "method", m.name)]
+        n_methods = len(visible_methods)
         if n_methods > 0 and n_methods < 24:
-            for m in ancestor.methods:
-                if not config.is_hidden(ancestor_name, "method", m.name):
-                    methods.append(gen_index_func(m, ancestor_ns, md))
+            methods = [gen_index_func(m, ancestor_ns, md) for m in visible_methods]
         for p in ancestor.properties.values():
             if not config.is_hidden(ancestor_name, "property", p.name):
                 n_properties += 1
@@ -319,10 +339,17 @@ def gen_index_ancestor(ancestor_type, namespace, config, md=None):
 
 
 def gen_index_implements(iface_type, namespace, config, md=None):
-    iface_name = iface_type.name
-    if '.' in iface_name:
-        ns, iface_name = iface_name.split('.')
-    else:
+    cache_key = (iface_type.name, iface_type.namespace, namespace.name)
+    res = _index_implements.get(cache_key)
+    if res is None:
+        res = _gen_index_implements(iface_type, namespace, config, md)
+        _index_implements[cache_key] = res
+    return res
+
+
+def _gen_index_implements(iface_type, namespace, config, md=None):
+    ns, _, iface_name = iface_type.name.rpartition('.')
+    if not ns:
         ns = iface_type.namespace or namespace.name
     res = namespace.repository.find_interface(iface_name, ns)
     if res is not None:
@@ -344,14 +371,10 @@ def gen_index_implements(iface_type, namespace, config, md=None):
     if iface is not None:
         # Set a hard-limit on the number of methods; base types can
         # add *a lot* of them; two dozens feel like a good compromise
-        for m in iface.methods:
-            is_hidden = config.is_hidden(iface_name, "method", m.name)
-            if not is_hidden:
-                n_methods += 1
+        visible_methods = [m for m in iface.methods if not config.is_hidden(iface_name, "method", m.name)]
+        n_methods = len(visible_methods)
         if n_methods > 0 and n_methods < 24:
-            for m in iface.methods:
-                if not config.is_hidden(iface_name, "method", m.name):
-                    methods.append(gen_index_func(m, iface_ns, md))
+            methods = [gen_index_func(m, iface_ns, md) for m in visible_methods]
         for p in iface.properties.values():
             if not config.is_hidden(iface_name, "property", p.name):
                 n_properties += 1
@@ -374,12 +397,16 @@ def gen_index_implements(iface_type, namespace, config, md=None):
     }
 
 
+# The same types are linked from every argument, return value and property
+# that uses them, and the repository does not change once it's been parsed,
+# so we only need to build each link once
+@functools.lru_cache(maxsize=None)
 def gen_type_link(repository, namespace, name, ctype=None):
     res = repository.find_type(name, ns=namespace)
     if res is None:
         if ctype is not None:
             return f"<code>{ctype}</code>"
-        elif name in ['utf8', 'filename']:
+        elif name in STRING_TYPE_NAMES:
             return "<code>char*</code>"
         else:
             return f"<code>{name}</code>"
@@ -388,43 +415,26 @@ def gen_type_link(repository, namespace, name, ctype=None):
     if t.is_fundamental:
         return f"<code>{t.ctype}</code>"
 
-    if isinstance(t, gir.Alias):
-        link = f"alias.{name}.html"
-    elif isinstance(t, gir.BitField):
-        link = f"flags.{name}.html"
-    elif isinstance(t, gir.Callback):
-        link = f"callback.{name}.html"
-    elif isinstance(t, gir.Class):
-        link = f"class.{name}.html"
-    elif isinstance(t, gir.ErrorDomain):
-        link = f"error.{name}.html"
-    elif isinstance(t, gir.Enumeration):
-        link = f"enum.{name}.html"
-    elif isinstance(t, gir.Interface):
-        link = f"iface.{name}.html"
-    elif isinstance(t, gir.Record):
-        link = f"struct.{name}.html"
-    elif isinstance(t, gir.Union):
-        link = f"union.{name}.html"
-    else:
+    fragment = TYPE_LINK_FRAGMENTS.get(type(t))
+    if fragment is None:
         return f"<code>{t.ctype}</code>"
 
-    text = f"<code>{t.ctype}</code>"
+    link = f"{fragment}.{name}.html"
+
     if ns.name == repository.namespace.name:
-        href = f'href="{link}"'
-        css_class = ""
-        data_link = ""
-        data_ns = ""
-    else:
-        href = 'href="javascript:void(0)"'
-        css_class = ' class="external"'
-        data_link = f' data-link="{link}"'
-        data_ns = f' data-namespace="{ns.name}"'
+        return f'<a href="{link}"><code>{t.ctype}</code></a>'
 
-    return f"<a {href}{data_link}{data_ns}{css_class}>{text}</a>"
+    return (f'<a href="javascript:void(0)" data-link="{link}" data-namespace="{ns.name}" class="external">'
+            f'<code>{t.ctype}</code></a>')
 
 
 class TemplateConstant:
+    __slots__ = (
+        'value', 'identifier', 'type_name', 'type_cname', 'namespace', 'name', 'fqtn', 'stability',
+        'attributes', 'available_since', 'introspectable', 'hierarchy_svg', 'summary', 'description',
+        'docs_location', 'deprecated_since'
+    )
+
     def __init__(self, namespace, const):
         self.value = const.value
         self.identifier = const.ctype
@@ -437,23 +447,18 @@ class TemplateConstant:
         if const.doc is not None:
             self.summary = utils.preprocess_docs(const.doc.content, namespace, summary=True)
             self.description = utils.preprocess_docs(const.doc.content, namespace)
-            filename = const.doc.filename
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
+            filename = _strip_parent_dirs(const.doc.filename)
             line = const.doc.line
-            const.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
         self.stability = const.stability
         self.attributes = const.attributes
         self.available_since = const.available_since
         if const.deprecated:
             (version, msg) = const.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace))
         else:
             self.deprecated_since = None
 
@@ -468,13 +473,92 @@ class TemplateConstant:
         return utils.code_highlight(f"#define {self.identifier} {self.value}")
 
 
+def _strip_symbol_prefix(namespace, t, identifier):
+    # Accessors are methods of the type, so their identifier starts with
+    # the namespace and type prefixes, in that order
+    prefix = f"{namespace.symbol_prefix[0]}_{t.symbol_prefix}_"
+    if identifier.startswith(prefix):
+        return identifier[len(prefix):]
+    func_name = identifier.replace(namespace.symbol_prefix[0] + '_', '')
+    return func_name.replace(t.symbol_prefix + '_', '')
+
+
+def _transform_set_attribute(namespace, prop, setter_func):
+    if setter_func is None:
+        log.warning(f"Missing value in the set attribute for {prop.name}")
+        return None
+    t = namespace.find_symbol(setter_func)
+    if t is None:
+        log.warning(f"Invalid Property.set attribute for {prop.name}: {setter_func}")
+        return setter_func
+    if not (isinstance(t, gir.Class) or isinstance(t, gir.Interface)):
+        log.warning(f"Invalid setter function {setter_func} for property {namespace.name}.{t.name}:{prop.name}")
+        return setter_func
+    func_name = _strip_symbol_prefix(namespace, t, setter_func)
+    href = f"method.{t.name}.{func_name}.html"
+    return Markup(f"<a href=\"{href}\"><code>{setter_func}</code></a>")
+
+
+def _transform_get_attribute(namespace, prop, getter_func):
+    if getter_func is None:
+        log.warning(f"Missing value in the get attribute for {prop.name}")
+        return None
+    t = namespace.find_symbol(getter_func)
+    if t is None:
+        log.warning(f"Invalid Property.get attribute for {prop.name}: {getter_func}")
+        return getter_func
+    if not (isinstance(t, gir.Class) or isinstance(t, gir.Interface)):
+        log.warning(f"Invalid getter function {getter_func} for property {namespace.name}.{t.name}:{prop.name}")
+        return getter_func
+    func_name = _strip_symbol_prefix(namespace, t, getter_func)
+    href = f"method.{t.name}.{func_name}.html"
+    return Markup(f"<a href=\"{href}\"><code>{getter_func}</code></a>")
+
+
+def _transform_default_attribute(namespace, prop, default_value):
+    if default_value is None:
+        log.warning(f"Missing value in the default attribute for {prop.name}")
+        return None
+    return Markup(f"<code>{default_value}</code>")
+
+
+def _gen_method_link(t, method):
+    m = t.find_method(method)
+    if m is None:
+        return None
+    href = f"method.{t.name}.{m.name}.html"
+    return Markup(f'<a href="{href}"><code>{m.identifier}()</code></a>')
+
+
+PROPERTY_ATTRIBUTE_NAMES = {
+    "org.gtk.Property.set": {
+        "label": "Setter method",
+        "transform": _transform_set_attribute,
+    },
+    "org.gtk.Property.get": {
+        "label": "Getter method",
+        "transform": _transform_get_attribute,
+    },
+    "org.gtk.Property.default": {
+        "label": "Default value",
+        "transform": _transform_default_attribute,
+    },
+}
+
+
 class TemplateProperty:
+    __slots__ = (
+        'name', 'is_fundamental', 'is_array', 'is_list', 'is_list_model', 'readable', 'writable',
+        'construct', 'construct_only', 'stability', 'available_since', 'introspectable', 'attributes',
+        'type_name', 'type_cname', 'summary', 'description', 'docs_location', 'deprecated_since', 'link'
+    )
+
     def __init__(self, namespace, type_, prop):
         self.name = prop.name
         self.is_fundamental = prop.target.is_fundamental
         self.is_array = isinstance(prop.target, gir.ArrayType)
         self.is_list = isinstance(prop.target, gir.ListType)
-        self.is_list_model = prop.target.name in ['Gio.ListModel', 'GListModel']
+        self.is_list_model = prop.target.name in LIST_MODEL_TYPE_NAMES
         self.readable = prop.readable
         self.writable = prop.writable
         self.construct = prop.construct
@@ -484,7 +568,7 @@ class TemplateProperty:
             self.type_cname = prop.target.ctype
         elif self.is_array or self.is_list:
             value_type = prop.target.value_type
-            if value_type.name in ['utf8', 'filename']:
+            if value_type.name in STRING_TYPE_NAMES:
                 self.type_name = "string[]"
                 self.type_cname = "char*"
             elif value_type.ctype is not None:
@@ -499,104 +583,39 @@ class TemplateProperty:
         if prop.doc is not None:
             self.summary = utils.preprocess_docs(prop.doc.content, namespace, summary=True)
             self.description = utils.preprocess_docs(prop.doc.content, namespace)
-            filename = prop.doc.filename
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
+            filename = _strip_parent_dirs(prop.doc.filename)
             line = prop.doc.line
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
         self.stability = prop.stability
         self.available_since = prop.available_since
         if prop.deprecated:
             (version, msg) = prop.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace))
         else:
             self.deprecated_since = None
 
         self.introspectable = prop.introspectable
 
-        def transform_set_attribute(namespace, prop, setter_func):
-            if setter_func is None:
-                log.warning(f"Missing value in the set attribute for {prop.name}")
-                return None
-            t = namespace.find_symbol(setter_func)
-            if t is None:
-                log.warning(f"Invalid Property.set attribute for {prop.name}: {setter_func}")
-                return setter_func
-            if not (isinstance(t, gir.Class) or isinstance(t, gir.Interface)):
-                log.warning(f"Invalid setter function {setter_func} for property {namespace.name}.{t.name}:{prop.name}")
-                return setter_func
-            func_name = setter_func.replace(namespace.symbol_prefix[0] + '_', '')
-            func_name = func_name.replace(t.symbol_prefix + '_', '')
-            href = f"method.{t.name}.{func_name}.html"
-            return Markup(f"<a href=\"{href}\"><code>{setter_func}</code></a>")
-
-        def transform_get_attribute(namespace, prop, getter_func):
-            if getter_func is None:
-                log.warning(f"Missing value in the get attribute for {prop.name}")
-                return None
-            t = namespace.find_symbol(getter_func)
-            if t is None:
-                log.warning(f"Invalid Property.get attribute for {prop.name}: {getter_func}")
-                return getter_func
-            if not (isinstance(t, gir.Class) or isinstance(t, gir.Interface)):
-                log.warning(f"Invalid getter function {getter_func} for property {namespace.name}.{t.name}:{prop.name}")
-                return getter_func
-            func_name = getter_func.replace(namespace.symbol_prefix[0] + '_', '')
-            func_name = func_name.replace(t.symbol_prefix + '_', '')
-            href = f"method.{t.name}.{func_name}.html"
-            return Markup(f"<a href=\"{href}\"><code>{getter_func}</code></a>")
-
-        def transform_default_attribute(namespace, prop, default_value):
-            if default_value is None:
-                log.warning(f"Missing value in the default attribute for {prop.name}")
-                return None
-            return Markup(f"<code>{default_value}</code>")
-
-        ATTRIBUTE_NAMES = {
-            "org.gtk.Property.set": {
-                "label": "Setter method",
-                "transform": transform_set_attribute,
-            },
-            "org.gtk.Property.get": {
-                "label": "Getter method",
-                "transform": transform_get_attribute,
-            },
-            "org.gtk.Property.default": {
-                "label": "Default value",
-                "transform": transform_default_attribute,
-            },
-        }
-
         self.attributes = {}
         for name in (prop.attributes or {}):
             value = prop.attributes[name]
-            if name in ATTRIBUTE_NAMES:
-                label = ATTRIBUTE_NAMES[name].get("label")
-                transform = ATTRIBUTE_NAMES[name].get("transform")
+            if name in PROPERTY_ATTRIBUTE_NAMES:
+                label = PROPERTY_ATTRIBUTE_NAMES[name].get("label")
+                transform = PROPERTY_ATTRIBUTE_NAMES[name].get("transform")
                 if transform is not None:
                     self.attributes[label] = transform(namespace, prop, value)
             else:
                 self.attributes[name] = value
 
-        def gen_method_link(ns, t, method):
-            for m in t.methods:
-                if m.name == method:
-                    href = f"method.{t.name}.{m.name}.html"
-                    return Markup(f'<a href="{href}"><code>{m.identifier}()</code></a>')
-            return None
-
         if prop.setter is not None:
-            link = gen_method_link(namespace, type_, prop.setter)
+            link = _gen_method_link(type_, prop.setter)
             if link is not None:
                 self.attributes["Setter method"] = link
         if prop.getter is not None:
-            link = gen_method_link(namespace, type_, prop.getter)
+            link = _gen_method_link(type_, prop.getter)
             if link is not None:
                 self.attributes["Getter method"] = link
 
@@ -608,10 +627,8 @@ class TemplateProperty:
         elif self.is_array or self.is_list:
             self.link = f"<code>{self.type_cname}</code>"
         elif prop.target.name is not None:
-            name = prop.target.name
-            if '.' in name:
-                ns, name = name.split('.')
-            else:
+            ns, _, name = prop.target.name.rpartition('.')
+            if not ns:
                 ns = namespace.name
             self.link = gen_type_link(namespace.repository, ns, name, self.type_cname)
 
@@ -619,18 +636,71 @@ class TemplateProperty:
     def c_decl(self):
         flags = []
         if self.readable:
-            flags += ['read']
+            flags.append('read')
         if self.writable:
-            flags += ['write']
+            flags.append('write')
         if self.construct:
-            flags += ['construct']
+            flags.append('construct')
         if self.construct_only:
-            flags += ['construct-only']
+            flags.append('construct-only')
         flags = ", ".join(flags)
         return f"property {self.name}: {self.type_name} [ {flags} ]"
 
 
+def _argument_type_cname(call, argument):
+    target = argument.target
+    if isinstance(call, gir.FunctionMacro):
+        return '-'
+    if isinstance(target, (gir.ArrayType, gir.ListType)):
+        if target.ctype is not None:
+            return target.ctype
+        if target.value_type.name in STRING_TYPE_NAMES:
+            return 'char**'
+        if target.value_type.ctype is not None:
+            return target.value_type.ctype + '*'
+        return 'gpointer'
+    if target.ctype is not None:
+        return target.ctype
+    if target.name in STRING_TYPE_NAMES:
+        return 'char*'
+    return type_name_to_cname(target.name, not target.is_fundamental)
+
+
+def _return_value_type_cname(retval):
+    if retval.target.ctype is not None:
+        return retval.target.ctype
+    return type_name_to_cname(retval.target.name, True)
+
+
+def _gen_value_type_link(namespace, value):
+    """Generates the type link of a TemplateArgument or TemplateReturnValue"""
+    if value.is_array or value.is_list or value.is_list_model:
+        name = value.value_type
+    else:
+        name = value.type_name
+    if name is None:
+        return None
+    if value.is_fundamental:
+        return f"<code>{value.type_cname}</code>"
+    if value.is_array or value.is_list:
+        return f"<code>{value.value_type_cname}</code>"
+    if value.is_list_model:
+        return f"<code>{value.value_type}</code>"
+    ns, _, name = name.rpartition('.')
+    if not ns:
+        ns = namespace.name
+    return gen_type_link(namespace.repository, ns, name, value.type_cname)
+
+
 class TemplateArgument:
+    __slots__ = (
+        'name', 'type_name', 'is_array', 'is_list', 'is_map', 'is_varargs', 'is_macro', 'is_list_model',
+        'is_fundamental', 'direction', 'direction_note', 'transfer', 'transfer_note', 'optional',
+        'nullable', 'scope', 'introspectable', 'type_cname', 'closure', 'value_type', 'value_type_cname',
+        'fixed_size', 'zero_terminated', 'len_arg', 'string_note', 'summary', 'description', 'link',
+        'is_pointer'
+    )
+
     def __init__(self, namespace, call, argument, callable_type):
         self.name = argument.name
         self.type_name = argument.target.name
@@ -639,35 +709,19 @@ class TemplateArgument:
         self.is_map = isinstance(argument.target, gir.MapType)
         self.is_varargs = isinstance(argument.target, gir.VarArgs)
         self.is_macro = isinstance(call, gir.FunctionMacro)
-        self.is_list_model = self.type_name in ['Gio.ListModel', 'GListModel']
+        self.is_list_model = self.type_name in LIST_MODEL_TYPE_NAMES
         self.is_fundamental = argument.target.is_fundamental
-        if isinstance(call, gir.FunctionMacro):
-            self.type_cname = '-'
-        elif self.is_array or self.is_list:
-            if argument.target.ctype is None:
-                if argument.target.value_type.name in ['utf8', 'filename']:
-                    self.type_cname = 'char**'
-                elif argument.target.value_type.ctype is not None:
-                    self.type_cname = argument.target.value_type.ctype + '*'
-                else:
-                    self.type_cname = 'gpointer'
-            else:
-                self.type_cname = argument.target.ctype
-        elif self.type_name in ['utf8', 'filename']:
-            if argument.target.ctype is None:
-                self.type_cname = 'char*'
-            else:
-                self.type_cname = argument.target.ctype
-        elif self.is_fundamental:
-            if argument.target.ctype is None:
-                self.type_cname = type_name_to_cname(argument.target.name, False)
-            else:
-                self.type_cname = argument.target.ctype
-        else:
-            self.type_cname = argument.target.ctype
-            if self.type_cname is None:
-                self.type_cname = type_name_to_cname(argument.target.name, True)
+        self.type_cname = _argument_type_cname(call, argument)
         self.direction = argument.direction or 'in'
+        # Templates check this more than once, so compute it upfront
+        if self.type_cname is None:
+            self.is_pointer = False
+        elif self.direction in ('out', 'inout') and self.is_fundamental and self.type_cname.count('*') == 1:
+            self.is_pointer = False
+        elif self.is_fundamental and self.type_cname in ('gpointer', 'gconstpointer'):
+            self.is_pointer = True
+        else:
+            self.is_pointer = '*' in self.type_cname
         self.direction_note = DIRECTION_MODES[argument.direction]
         self.transfer = argument.transfer or 'none'
         self.transfer_note = transfer_note(self.transfer, self.direction, callable_type)
@@ -690,49 +744,19 @@ class TemplateArgument:
             self.value_type_cname = argument.target.value_type.ctype
         if self.is_list_model:
             self.value_type = argument.attributes.get('element-type', 'GObject')
-        if self.type_name in ['utf8', 'filename']:
+        if self.type_name in STRING_TYPE_NAMES:
             self.string_note = STRING_TYPES[self.type_name]
         elif self.is_array or self.is_list:
-            if self.value_type in ['utf8', 'filename']:
+            if self.value_type in STRING_TYPE_NAMES:
                 self.string_note = STRING_ELEMENT_TYPES[self.value_type]
         if argument.doc is not None:
             self.summary = utils.preprocess_docs(argument.doc.content, namespace, summary=True)
             self.description = utils.preprocess_docs(argument.doc.content, namespace)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
-        if self.is_array:
-            name = self.value_type
-        elif self.is_list:
-            name = self.value_type
-        elif self.type_name is not None:
-            name = self.type_name
-        else:
-            name = None
-        if name is not None:
-            if self.is_fundamental:
-                self.link = f"<code>{self.type_cname}</code>"
-            elif self.is_array:
-                self.link = f"<code>{self.value_type_cname}</code>"
-            elif self.is_list:
-                self.link = f"<code>{self.value_type_cname}</code>"
-            elif self.is_list_model:
-                self.link = f"<code>{self.value_type}</code>"
-            else:
-                if '.' in name:
-                    ns, name = name.split('.')
-                else:
-                    ns = namespace.name
-                self.link = gen_type_link(namespace.repository, ns, name, self.type_cname)
-
-    @property
-    def is_pointer(self):
-        if self.type_cname is None:
-            return False
-        if self.direction in ['out', 'inout'] and self.is_fundamental and self.type_cname.count('*') == 1:
-            return False
-        if self.is_fundamental and self.type_cname in ['gpointer', 'gconstpointer']:
-            return True
-        return '*' in self.type_cname
+            self.description = MISSING_DESCRIPTION_MARKUP
+        link = _gen_value_type_link(namespace, self)
+        if link is not None:
+            self.link = link
 
     @property
     def c_decl(self):
@@ -745,16 +769,28 @@ class TemplateArgument:
 
 
 class TemplateReturnValue:
+    __slots__ = (
+        'name', 'type_name', 'type_cname', 'is_fundamental', 'is_array', 'is_list', 'is_list_model',
+        'transfer', 'transfer_note', 'nullable', 'introspectable', 'value_type', 'value_type_cname',
+        'fixed_size', 'zero_terminated', 'len_arg', 'string_note', 'summary', 'description', 'link',
+        'is_pointer'
+    )
+
     def __init__(self, namespace, call, retval, callable_type):
         self.name = retval.name
         self.type_name = retval.target.name
-        self.type_cname = retval.target.ctype
+        self.type_cname = _return_value_type_cname(retval)
         self.is_fundamental = retval.target.is_fundamental
+        # Templates check this more than once, so compute it upfront
         if self.type_cname is None:
-            self.type_cname = type_name_to_cname(retval.target.name, True)
+            self.is_pointer = False
+        elif self.is_fundamental and self.type_cname in ('gpointer', 'gconstpointer'):
+            self.is_pointer = True
+        else:
+            self.is_pointer = '*' in self.type_cname
         self.is_array = isinstance(retval.target, gir.ArrayType)
         self.is_list = isinstance(retval.target, gir.ListType)
-        self.is_list_model = self.type_name in ['Gio.ListModel', 'GListModel']
+        self.is_list_model = self.type_name in LIST_MODEL_TYPE_NAMES
         self.transfer = retval.transfer or 'none'
         transfer_mode = RETURN_TRANSFER_MODES[callable_type]
         self.transfer_note = transfer_mode.get(self.transfer)
@@ -770,54 +806,29 @@ class TemplateReturnValue:
             self.value_type_cname = retval.target.value_type.ctype
         if self.is_list_model:
             self.value_type = retval.attributes.get('element-type', 'GObject')
-        if self.type_name in ['utf8', 'filename']:
+        if self.type_name in STRING_TYPE_NAMES:
             self.string_note = STRING_TYPES[self.type_name]
         elif self.is_array or self.is_list:
-            if self.value_type in ['utf8', 'filename']:
+            if self.value_type in STRING_TYPE_NAMES:
                 self.string_note = STRING_ELEMENT_TYPES[self.value_type]
         if retval.doc is not None:
             self.summary = utils.preprocess_docs(retval.doc.content, namespace, summary=True)
             self.description = utils.preprocess_docs(retval.doc.content, namespace)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
         self.introspectable = retval.introspectable
-        if self.is_array:
-            name = self.value_type
-        elif self.is_list:
-            name = self.value_type
-        elif self.is_list_model:
-            name = self.value_type
-        elif self.type_name is not None:
-            name = self.type_name
-        else:
-            name = None
-        if name is not None:
-            if self.is_fundamental:
-                self.link = f"<code>{self.type_cname}</code>"
-            elif self.is_array:
-                self.link = f"<code>{self.value_type_cname}</code>"
-            elif self.is_list:
-                self.link = f"<code>{self.value_type_cname}</code>"
-            elif self.is_list_model:
-                self.link = f"<code>{self.value_type}</code>"
-            else:
-                if '.' in name:
-                    ns, name = name.split('.')
-                else:
-                    ns = namespace.name
-                self.link = gen_type_link(namespace.repository, ns, name, self.type_cname)
-
-    @property
-    def is_pointer(self):
-        if self.type_cname is None:
-            return False
-        elif self.is_fundamental and self.type_cname in ['gpointer', 'gconstpointer']:
-            return True
-        else:
-            return '*' in self.type_cname
+        link = _gen_value_type_link(namespace, self)
+        if link is not None:
+            self.link = link
 
 
 class TemplateSignal:
+    __slots__ = (
+        'name', 'type_cname', 'identifier', 'summary', 'description', 'docs_location', 'is_detailed',
+        'is_action', 'no_recurse', 'no_hooks', 'when', 'arguments', 'return_value', 'stability', 'attributes',
+        'available_since', 'deprecated_since', 'introspectable'
+    )
+
     def __init__(self, namespace, type_, signal):
         self.name = signal.name
         self.type_cname = type_.base_ctype
@@ -826,13 +837,11 @@ class TemplateSignal:
         if signal.doc is not None:
             self.summary = utils.preprocess_docs(signal.doc.content, namespace, summary=True)
             self.description = utils.preprocess_docs(signal.doc.content, namespace)
-            filename = signal.doc.filename
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
+            filename = _strip_parent_dirs(signal.doc.filename)
             line = signal.doc.line
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
         self.is_detailed = signal.detailed
         self.is_action = signal.action
@@ -841,23 +850,19 @@ class TemplateSignal:
         if signal.when:
             self.when = utils.preprocess_docs(SIGNAL_WHEN[signal.when], namespace)
 
-        self.arguments = []
-        for arg in signal.parameters:
-            self.arguments.append(TemplateArgument(namespace, signal, arg, CallableType.SIGNAL))
+        call_type = CallableType.SIGNAL
+        self.arguments = [TemplateArgument(namespace, signal, arg, call_type) for arg in signal.parameters]
 
         self.return_value = None
         if not isinstance(signal.return_value.target, gir.VoidType):
-            self.return_value = TemplateReturnValue(namespace, signal, signal.return_value, CallableType.SIGNAL)
+            self.return_value = TemplateReturnValue(namespace, signal, signal.return_value, call_type)
 
         self.stability = signal.stability
         self.attributes = signal.attributes
         self.available_since = signal.available_since
         if signal.deprecated:
             (version, msg) = signal.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace))
         else:
             self.deprecated_since = None
 
@@ -867,19 +872,69 @@ class TemplateSignal:
     def c_decl(self):
         res = []
         if self.return_value is None:
-            res += ["void"]
+            res.append("void")
         else:
-            res += [f"{self.return_value.type_cname}"]
-        res += [f"{self.identifier} ("]
-        res += [f"  {self.type_cname}* self,"]
+            res.append(f"{self.return_value.type_cname}")
+        res.append(f"{self.identifier} (")
+        res.append(f"  {self.type_cname}* self,")
         for arg in self.arguments:
-            res += [f"  {arg.c_decl},"]
-        res += ["  gpointer user_data"]
-        res += [")"]
+            res.append(f"  {arg.c_decl},")
+        res.append("  gpointer user_data")
+        res.append(")")
         return utils.code_highlight("\n".join(res))
 
 
+def _transform_property_attribute(namespace, type_, method, value):
+    if value in type_.properties:
+        text = f"{namespace.name}.{type_.name}:{value}"
+        href = f"property.{type_.name}.{value}.html"
+        return Markup(f"<a href=\"{href}\"><code>{text}</code></a>")
+    log.warning(f"Property {value} linked to method {method.name} not found in {namespace.name}.{type_.name}")
+    return value
+
+
+def _transform_signal_attribute(namespace, type_, method, value):
+    if value in type_.signals:
+        text = f"{namespace.name}.{type_.name}::{value}"
+        href = f"signal.{type_.name}.{value}.html"
+        return Markup(f"<a href=\"{href}\"><code>{text}</code></a>")
+    log.warning(f"Signal {value} linked to method {method.name} not found in {namespace.name}.{type_.name}")
+    return value
+
+
+METHOD_ATTRIBUTE_NAMES = {
+    "org.gtk.Method.set_property": {
+        "label": "Sets property",
+        "transform": _transform_property_attribute,
+    },
+    "org.gtk.Method.get_property": {
+        "label": "Gets property",
+        "transform": _transform_property_attribute,
+    },
+    "org.gtk.Method.signal": {
+        "label": "Emits signal",
+        "transform": _transform_signal_attribute,
+    },
+}
+
+
+def _gen_property_link(namespace, t, prop_name):
+    if prop_name not in t.properties:
+        return None
+    prop = t.properties[prop_name]
+    text = f"{namespace.name}.{t.name}:{prop.name}"
+    href = f"property.{t.name}.{prop.name}.html"
+    return Markup(f'<a href="{href}"><code>{text}</code></a>')
+
+
 class TemplateMethod:
+    __slots__ = (
+        'name', 'identifier', 'summary', 'description', 'docs_location', 'is_inline', 'throws',
+        'instance_parameter', 'arguments', 'return_value', 'stability', 'available_since', 'deprecated_since',
+        'source_location', 'introspectable', 'shadows', 'shadows_symbol', 'shadowed_by', 'shadowed_by_symbol',
+        'finish_func', 'finish_func_symbol', 'attributes'
+    )
+
     def __init__(self, namespace, type_, method):
         self.name = method.name
         self.identifier = method.identifier
@@ -887,123 +942,74 @@ class TemplateMethod:
         if method.doc is not None:
             self.summary = utils.preprocess_docs(method.doc.content, namespace, summary=True)
             self.description = utils.preprocess_docs(method.doc.content, namespace)
-            filename = method.doc.filename
+            filename = _strip_parent_dirs(method.doc.filename)
             line = method.doc.line
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
         self.is_inline = method.inline
         self.throws = method.throws
 
-        self.instance_parameter = TemplateArgument(namespace, method, method.instance_param, CallableType.METHOD)
+        call_type = CallableType.METHOD
+        self.instance_parameter = TemplateArgument(namespace, method, method.instance_param, call_type)
 
-        self.arguments = []
-        for arg in method.parameters:
-            self.arguments.append(TemplateArgument(namespace, method, arg, CallableType.METHOD))
+        self.arguments = [TemplateArgument(namespace, method, arg, call_type) for arg in method.parameters]
 
         self.return_value = None
         if not isinstance(method.return_value.target, gir.VoidType):
-            self.return_value = TemplateReturnValue(namespace, method, method.return_value, CallableType.METHOD)
+            self.return_value = TemplateReturnValue(namespace, method, method.return_value, call_type)
 
         self.stability = method.stability
         self.available_since = method.available_since
         if method.deprecated:
             (version, msg) = method.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace))
         else:
             self.deprecated_since = None
 
         if method.source_position is not None:
             filename, line = method.source_position
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.source_location = (filename, line)
+            filename = _strip_parent_dirs(filename)
+            self.source_location = DocsLocation(filename, line)
 
         self.introspectable = method.introspectable
 
         self.shadows = method.shadows
         if method.shadows:
-            for m in type_.methods:
-                if m.name == method.shadows:
-                    self.shadows_symbol = m.identifier
-                    break
+            m = type_.find_method(method.shadows)
+            if m is not None:
+                self.shadows_symbol = m.identifier
         self.shadowed_by = method.shadowed_by
         if method.shadowed_by:
-            for m in type_.methods:
-                if m.name == method.shadowed_by:
-                    self.shadowed_by_symbol = m.identifier
-                    break
+            m = type_.find_method(method.shadowed_by)
+            if m is not None:
+                self.shadowed_by_symbol = m.identifier
 
         self.finish_func = method.finish_func
         if method.finish_func:
-            for m in type_.methods:
-                if m.name == method.finish_func:
-                    self.finish_func_symbol = m.identifier
-                    break
-
-        def transform_property_attribute(namespace, type_, method, value):
-            if value in type_.properties:
-                text = f"{namespace.name}.{type_.name}:{value}"
-                href = f"property.{type_.name}.{value}.html"
-                return Markup(f"<a href=\"{href}\"><code>{text}</code></a>")
-            log.warning(f"Property {value} linked to method {method.name} not found in {namespace.name}.{type_.name}")
-            return value
-
-        def transform_signal_attribute(namespace, type_, method, value):
-            if value in type_.signals:
-                text = f"{namespace.name}.{type_.name}::{value}"
-                href = f"signal.{type_.name}.{value}.html"
-                return Markup(f"<a href=\"{href}\"><code>{text}</code></a>")
-            log.warning(f"Signal {value} linked to method {method.name} not found in {namespace.name}.{type_.name}")
-            return value
-
-        ATTRIBUTE_NAMES = {
-            "org.gtk.Method.set_property": {
-                "label": "Sets property",
-                "transform": transform_property_attribute,
-            },
-            "org.gtk.Method.get_property": {
-                "label": "Gets property",
-                "transform": transform_property_attribute,
-            },
-            "org.gtk.Method.signal": {
-                "label": "Emits signal",
-                "transform": transform_signal_attribute,
-            }
-        }
+            m = type_.find_method(method.finish_func)
+            if m is not None:
+                self.finish_func_symbol = m.identifier
 
         self.attributes = {}
         for name in (method.attributes or {}):
             value = method.attributes[name]
-            if name in ATTRIBUTE_NAMES:
-                label = ATTRIBUTE_NAMES[name].get("label")
-                transform = ATTRIBUTE_NAMES[name].get("transform")
+            if name in METHOD_ATTRIBUTE_NAMES:
+                label = METHOD_ATTRIBUTE_NAMES[name].get("label")
+                transform = METHOD_ATTRIBUTE_NAMES[name].get("transform")
                 if transform is not None:
                     self.attributes[label] = transform(namespace, type_, method, value)
             else:
                 self.attributes[name] = value
 
-        def gen_property_link(namespace, t, prop_name):
-            if prop_name not in t.properties:
-                return None
-            prop = t.properties[prop_name]
-            text = f"{namespace.name}.{t.name}:{prop.name}"
-            href = f"property.{t.name}.{prop.name}.html"
-            return Markup(f'<a href="{href}"><code>{text}</code></a>')
-
         if isinstance(method, gir.Method):
             if method.set_property is not None:
-                link = gen_property_link(namespace, type_, method.set_property)
+                link = _gen_property_link(namespace, type_, method.set_property)
                 if link is not None:
                     self.attributes["Sets property"] = link
             if method.get_property is not None:
-                link = gen_property_link(namespace, type_, method.get_property)
+                link = _gen_property_link(namespace, type_, method.get_property)
                 if link is not None:
                     self.attributes["Gets property"] = link
 
@@ -1015,30 +1021,36 @@ class TemplateMethod:
         else:
             retval = self.return_value.type_cname
         if self.is_inline:
-            res += [f"static inline {retval}"]
+            res.append(f"static inline {retval}")
         else:
-            res += [retval]
+            res.append(retval)
         if self.identifier is not None:
-            res += [f"{self.identifier} ("]
+            res.append(f"{self.identifier} (")
         else:
-            res += [f"{self.name} ("]
+            res.append(f"{self.name} (")
         n_args = len(self.arguments)
         if n_args == 0:
-            res += [f"  {self.instance_parameter.type_cname} {self.instance_parameter.name}"]
+            res.append(f"  {self.instance_parameter.type_cname} {self.instance_parameter.name}")
         else:
-            res += [f"  {self.instance_parameter.type_cname} {self.instance_parameter.name},"]
+            res.append(f"  {self.instance_parameter.type_cname} {self.instance_parameter.name},")
             for (idx, arg) in enumerate(self.arguments):
                 if idx == n_args - 1 and not self.throws:
-                    res += [f"  {arg.c_decl}"]
+                    res.append(f"  {arg.c_decl}")
                 else:
-                    res += [f"  {arg.c_decl},"]
+                    res.append(f"  {arg.c_decl},")
         if self.throws:
-            res += ["  GError** error"]
-        res += [")"]
+            res.append("  GError** error")
+        res.append(")")
         return utils.code_highlight("\n".join(res))
 
 
 class TemplateClassMethod:
+    __slots__ = (
+        'name', 'identifier', 'class_type_cname', 'throws', 'summary', 'description', 'docs_location',
+        'instance_parameter', 'arguments', 'return_value', 'stability', 'attributes', 'available_since',
+        'deprecated_since', 'source_location', 'introspectable'
+    )
+
     def __init__(self, namespace, cls, method):
         self.name = method.name
         self.identifier = method.identifier
@@ -1049,41 +1061,34 @@ class TemplateClassMethod:
         if method.doc is not None:
             self.summary = utils.preprocess_docs(method.doc.content, namespace, summary=True)
             self.description = utils.preprocess_docs(method.doc.content, namespace)
-            filename = method.doc.filename
+            filename = _strip_parent_dirs(method.doc.filename)
             line = method.doc.line
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
-        self.instance_parameter = TemplateArgument(namespace, method, method.instance_param, CallableType.CLASS_METHOD)
+        call_type = CallableType.CLASS_METHOD
+        self.instance_parameter = TemplateArgument(namespace, method, method.instance_param, call_type)
 
-        self.arguments = []
-        for arg in method.parameters:
-            self.arguments.append(TemplateArgument(namespace, method, arg, CallableType.CLASS_METHOD))
+        self.arguments = [TemplateArgument(namespace, method, arg, call_type) for arg in method.parameters]
 
         self.return_value = None
         if not isinstance(method.return_value.target, gir.VoidType):
-            self.return_value = TemplateReturnValue(namespace, method, method.return_value, CallableType.CLASS_METHOD)
+            self.return_value = TemplateReturnValue(namespace, method, method.return_value, call_type)
 
         self.stability = method.stability
         self.attributes = method.attributes
         self.available_since = method.available_since
         if method.deprecated:
             (version, msg) = method.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace))
         else:
             self.deprecated_since = None
 
         if method.source_position is not None:
             filename, line = method.source_position
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.source_location = (filename, line)
+            filename = _strip_parent_dirs(filename)
+            self.source_location = DocsLocation(filename, line)
 
         self.introspectable = method.introspectable
 
@@ -1091,27 +1096,34 @@ class TemplateClassMethod:
     def c_decl(self):
         res = []
         if self.return_value is None:
-            res += ["void"]
+            res.append("void")
         else:
-            res += [f"{self.return_value.type_cname}"]
-        res += [f"{self.identifier} ("]
+            res.append(f"{self.return_value.type_cname}")
+        res.append(f"{self.identifier} (")
         n_args = len(self.arguments)
         if n_args == 0:
-            res += [f"  {self.instance_parameter.type_cname} {self.instance_parameter.name}"]
+            res.append(f"  {self.instance_parameter.type_cname} {self.instance_parameter.name}")
         else:
-            res += [f"  {self.instance_parameter.type_cname} {self.instance_parameter.name},"]
+            res.append(f"  {self.instance_parameter.type_cname} {self.instance_parameter.name},")
             for (idx, arg) in enumerate(self.arguments):
                 if idx == n_args - 1 and not self.throws:
-                    res += [f"  {arg.c_decl}"]
+                    res.append(f"  {arg.c_decl}")
                 else:
-                    res += [f"  {arg.c_decl},"]
+                    res.append(f"  {arg.c_decl},")
         if self.throws:
-            res += ["  GError** error"]
-        res += [")"]
+            res.append("  GError** error")
+        res.append(")")
         return utils.code_highlight("\n".join(res))
 
 
 class TemplateFunction:
+    __slots__ = (
+        'identifier', 'name', 'namespace', 'is_type_func', 'is_macro', 'is_inline', 'throws', 'summary',
+        'description', 'docs_location', 'arguments', 'return_value', 'stability', 'attributes',
+        'available_since', 'deprecated_since', 'source_location', 'introspectable', 'shadows',
+        'shadows_symbol', 'shadowed_by', 'shadowed_by_symbol', 'finish_func', 'finish_func_symbol'
+    )
+
     def __init__(self, namespace, type_, func):
         self.identifier = func.identifier
         self.name = func.name
@@ -1126,39 +1138,32 @@ class TemplateFunction:
         if func.doc is not None:
             self.summary = utils.preprocess_docs(func.doc.content, namespace, summary=True)
             self.description = utils.preprocess_docs(func.doc.content, namespace)
-            filename = func.doc.filename
+            filename = _strip_parent_dirs(func.doc.filename)
             line = func.doc.line
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
-        self.arguments = []
-        for arg in func.parameters:
-            self.arguments.append(TemplateArgument(namespace, func, arg, CallableType.FUNCTION))
+        call_type = CallableType.FUNCTION
+        self.arguments = [TemplateArgument(namespace, func, arg, call_type) for arg in func.parameters]
 
         self.return_value = None
         if not isinstance(func.return_value.target, gir.VoidType):
-            self.return_value = TemplateReturnValue(namespace, func, func.return_value, CallableType.FUNCTION)
+            self.return_value = TemplateReturnValue(namespace, func, func.return_value, call_type)
 
         self.stability = func.stability
         self.attributes = func.attributes
         self.available_since = func.available_since
         if func.deprecated:
             (version, msg) = func.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace))
         else:
             self.deprecated_since = None
 
         if func.source_position is not None:
             filename, line = func.source_position
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.source_location = (filename, line)
+            filename = _strip_parent_dirs(filename)
+            self.source_location = DocsLocation(filename, line)
 
         self.introspectable = func.introspectable
 
@@ -1192,57 +1197,59 @@ class TemplateFunction:
     def c_decl(self):
         res = []
         if self.is_macro:
-            res += [f"#define {self.identifier} ("]
+            res.append(f"#define {self.identifier} (")
         else:
             if self.return_value is None:
                 retval = "void"
             else:
                 retval = self.return_value.type_cname
             if self.is_inline:
-                res += [f"static inline {retval}"]
+                res.append(f"static inline {retval}")
             else:
-                res += [retval]
-            res += [f"{self.identifier} ("]
+                res.append(retval)
+            res.append(f"{self.identifier} (")
         n_args = len(self.arguments)
         if n_args == 0:
-            res += ["  void"]
+            res.append("  void")
         else:
             for (idx, arg) in enumerate(self.arguments):
                 if idx == n_args - 1 and not self.throws:
-                    res += [f"  {arg.c_decl}"]
+                    res.append(f"  {arg.c_decl}")
                 else:
-                    res += [f"  {arg.c_decl},"]
+                    res.append(f"  {arg.c_decl},")
         if self.throws:
-            res += ["  GError** error"]
-        res += [")"]
+            res.append("  GError** error")
+        res.append(")")
         return utils.code_highlight("\n".join(res))
 
 
 class TemplateCallback:
-    def __init__(self, namespace, cb, field=False):
+    __slots__ = (
+        'name', 'type_cname', 'identifier', 'summary', 'description', 'docs_location', 'arguments',
+        'return_value', 'throws', 'stability', 'attributes', 'available_since', 'deprecated_since',
+        'introspectable'
+    )
+
+    def __init__(self, namespace, cb):
         self.name = cb.name
         self.type_cname = cb.ctype
         self.identifier = cb.name.replace("-", "_")
-        self.field = field
 
         if cb.doc is not None:
             self.summary = utils.preprocess_docs(cb.doc.content, namespace, summary=True)
             self.description = utils.preprocess_docs(cb.doc.content, namespace)
-            filename = cb.doc.filename
+            filename = _strip_parent_dirs(cb.doc.filename)
             line = cb.doc.line
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
-        self.arguments = []
-        for arg in cb.parameters:
-            self.arguments.append(TemplateArgument(namespace, cb, arg, CallableType.CALLBACK))
+        call_type = CallableType.CALLBACK
+        self.arguments = [TemplateArgument(namespace, cb, arg, call_type) for arg in cb.parameters]
 
         self.return_value = None
         if not isinstance(cb.return_value.target, gir.VoidType):
-            self.return_value = TemplateReturnValue(namespace, cb, cb.return_value, CallableType.CALLBACK)
+            self.return_value = TemplateReturnValue(namespace, cb, cb.return_value, call_type)
 
         self.throws = cb.throws
 
@@ -1251,10 +1258,7 @@ class TemplateCallback:
         self.available_since = cb.available_since
         if cb.deprecated:
             (version, msg) = cb.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace))
         else:
             self.deprecated_since = None
 
@@ -1263,48 +1267,63 @@ class TemplateCallback:
     @property
     def c_decl(self):
         res = []
-        if self.field:
-            arg_indent = "    "
-        else:
-            arg_indent = "  "
         if self.return_value is None:
             retval = "void"
         else:
             retval = f"{self.return_value.type_cname}"
-        if self.field:
-            res += [f"{retval} (* {self.identifier}) ("]
-        else:
-            res += [retval]
-            res += [f"(* {self.type_cname}) ("]
+        res.append(retval)
+        res.append(f"(* {self.type_cname}) (")
         n_args = len(self.arguments)
         if n_args == 0:
-            res += ["void"]
+            res.append("void")
         else:
             for (idx, arg) in enumerate(self.arguments):
                 if idx == n_args - 1 and not self.throws:
-                    res += [f"{arg_indent}{arg.type_cname} {arg.name}"]
+                    res.append(f"  {arg.type_cname} {arg.name}")
                 else:
-                    res += [f"{arg_indent}{arg.type_cname} {arg.name},"]
+                    res.append(f"  {arg.type_cname} {arg.name},")
         if self.throws:
-            res += [f"{arg_indent}GError** error"]
-        if self.field:
-            res += ["  )"]
-        else:
-            res += [")"]
-        if self.field:
-            return "\n".join(res)
-        else:
-            return utils.code_highlight("\n".join(res))
+            res.append("  GError** error")
+        res.append(")")
+        return utils.code_highlight("\n".join(res))
+
+
+def _gen_callback_field_c_decl(cb):
+    # Callback fields only need the C declaration, so there's no point in
+    # creating a whole TemplateCallback, and processing its documentation
+    if isinstance(cb.return_value.target, gir.VoidType):
+        retval = "void"
+    else:
+        retval = _return_value_type_cname(cb.return_value)
+    identifier = cb.name.replace("-", "_")
+    res = [f"{retval} (* {identifier}) ("]
+    n_args = len(cb.parameters)
+    if n_args == 0:
+        res.append("void")
+    else:
+        for (idx, arg) in enumerate(cb.parameters):
+            if idx == n_args - 1 and not cb.throws:
+                res.append(f"    {_argument_type_cname(cb, arg)} {arg.name}")
+            else:
+                res.append(f"    {_argument_type_cname(cb, arg)} {arg.name},")
+    if cb.throws:
+        res.append("    GError** error")
+    res.append("  )")
+    return "\n".join(res)
 
 
 class TemplateField:
+    __slots__ = (
+        'name', 'is_callback', 'type_cname', 'type_name', 'private', 'bits', 'description', 'introspectable'
+    )
+
     def __init__(self, namespace, field):
         self.name = field.name
         if field.target is not None:
             if isinstance(field.target, gir.Callback):
                 self.is_callback = True
                 self.type_name: field.target.name
-                self.type_cname = TemplateCallback(namespace, field.target, field=True).c_decl
+                self.type_cname = _gen_callback_field_c_decl(field.target)
             else:
                 self.is_callback = False
                 self.type_name = field.target.name
@@ -1318,46 +1337,57 @@ class TemplateField:
         if field.doc is not None:
             self.description = utils.preprocess_docs(field.doc.content, namespace)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
         self.introspectable = field.introspectable
 
 
 class TemplateInterface:
+    __slots__ = (
+        'namespace', 'name', 'fqtn', 'requires', 'link_prefix', 'description', 'requires_namespace',
+        'requires_name', 'requires_ctype', 'requires_fqtn', 'requires_link_fragment', 'symbol_prefix',
+        'type_cname', 'summary', 'description_toc', 'docs_location', 'stability', 'attributes',
+        'available_since', 'deprecated_since', 'introspectable', 'class_name', 'class_struct',
+        'class_description', 'class_fields', 'class_methods', 'properties', 'signals', 'methods',
+        'virtual_methods', 'type_funcs', 'implementations'
+    )
+
     def __init__(self, namespace, interface, config):
         if isinstance(interface, gir.Interface):
-            if '.' in interface.name:
-                self.namespace, self.name = interface.name.split('.')
+            ns, sep, name = interface.name.partition('.')
+            if sep:
+                self.namespace, self.name = ns, name
                 self.fqtn = interface.name
             else:
                 self.namespace = interface.namespace
                 self.name = interface.name
                 self.fqtn = f"{self.namespace}.{self.name}"
         elif isinstance(interface, gir.Type):
-            if '.' in interface.name:
-                self.namespace, self.name = interface.name.split('.')
+            ns, sep, name = interface.name.partition('.')
+            if sep:
+                self.namespace, self.name = ns, name
             else:
                 self.namespace = interface.namespace or namespace.name
                 self.name = interface.name
             self.fqtn = f"{self.namespace}.{self.name}"
             self.requires = "GObject.Object"
             self.link_prefix = "iface"
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
             return
 
-        md = markdown.Markdown(extensions=utils.MD_EXTENSIONS,
-                               extension_configs=utils.MD_EXTENSIONS_CONF)
+        md = utils.get_markdown()
 
         requires = interface.prerequisite
         if requires is None:
             self.requires_namespace = "GObject"
             self.requires_name = "Object"
             self.requires_ctype = "GObject"
-        elif '.' in requires.name:
-            self.requires_namespace, self.requires_name = requires.name.split('.')
-            self.requires_ctype = requires.ctype
         else:
-            self.requires_namespace = requires.namespace or namespace.name
-            self.requires_name = requires.name
+            ns, sep, name = requires.name.partition('.')
+            if sep:
+                self.requires_namespace, self.requires_name = ns, name
+            else:
+                self.requires_namespace = requires.namespace or namespace.name
+                self.requires_name = requires.name
             self.requires_ctype = requires.ctype
 
         self.requires_fqtn = f"{self.requires_namespace}.{self.requires_name}"
@@ -1381,24 +1411,19 @@ class TemplateInterface:
         if interface.doc is not None:
             self.summary = utils.preprocess_docs(interface.doc.content, namespace, summary=True, md=md)
             self.description = utils.preprocess_docs(interface.doc.content, namespace, md=md)
-            self.description_toc = md.toc_tokens is not None and md.toc_tokens.copy() or None
-            filename = interface.doc.filename
+            self.description_toc = md.toc_tokens or None
+            filename = _strip_parent_dirs(interface.doc.filename)
             line = interface.doc.line
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
         self.stability = interface.stability
         self.attributes = interface.attributes
         self.available_since = interface.available_since
         if interface.deprecated:
             (version, msg) = interface.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace))
         else:
             self.deprecated_since = None
 
@@ -1411,11 +1436,8 @@ class TemplateInterface:
             if self.class_struct.doc:
                 self.class_description = utils.preprocess_docs(self.class_struct.doc.content, namespace, md=md)
             else:
-                self.class_description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
-            self.class_fields = []
-            for field in self.class_struct.fields:
-                if not field.private:
-                    self.class_fields.append(TemplateField(namespace, field))
+                self.class_description = MISSING_DESCRIPTION_MARKUP
+            self.class_fields = [TemplateField(namespace, field) for field in self.class_struct.fields if not field.private]
             self.class_methods = []
             for method in self.class_struct.methods:
                 self.class_methods.append(gen_index_func(method, namespace, md))
@@ -1424,41 +1446,30 @@ class TemplateInterface:
             self.class_methods = []
 
         self.properties = []
-        if len(interface.properties) != 0:
-            for pname, prop in interface.properties.items():
-                if not config.is_hidden(interface.name, "property", pname):
-                    self.properties.append(gen_index_property(prop, namespace, md))
+        for pname, prop in interface.properties.items():
+            if not config.is_hidden(interface.name, "property", pname):
+                self.properties.append(gen_index_property(prop, namespace, md))
 
         self.signals = []
-        if len(interface.signals) != 0:
-            for sname, signal in interface.signals.items():
-                if not config.is_hidden(interface.name, "signal", sname):
-                    self.signals.append(gen_index_signal(signal, namespace, md))
+        for sname, signal in interface.signals.items():
+            if not config.is_hidden(interface.name, "signal", sname):
+                self.signals.append(gen_index_signal(signal, namespace, md))
 
         self.methods = []
-        if len(interface.methods) != 0:
-            for method in interface.methods:
-                if not config.is_hidden(interface.name, "method", method.name):
-                    self.methods.append(gen_index_func(method, namespace, md))
+        for method in interface.methods:
+            if not config.is_hidden(interface.name, "method", method.name):
+                self.methods.append(gen_index_func(method, namespace, md))
 
         self.virtual_methods = []
-        if len(interface.virtual_methods) != 0:
-            for vfunc in interface.virtual_methods:
-                self.virtual_methods.append(gen_index_func(vfunc, namespace, md))
+        for vfunc in interface.virtual_methods:
+            self.virtual_methods.append(gen_index_func(vfunc, namespace, md))
 
         self.type_funcs = []
-        if len(interface.functions) != 0:
-            for func in interface.functions:
-                if not config.is_hidden(interface.name, "function", func.name):
-                    self.type_funcs.append(gen_index_func(func, namespace, md))
+        for func in interface.functions:
+            if not config.is_hidden(interface.name, "function", func.name):
+                self.type_funcs.append(gen_index_func(func, namespace, md))
 
-        self.implementations = []
-        if len(interface.implementations) != 0:
-            for impl in interface.implementations:
-                self.implementations.append({
-                    'name': impl.name,
-                    'ctype': impl.ctype,
-                })
+        self.implementations = [TypeRef(impl.name, impl.ctype) for impl in interface.implementations]
 
     @property
     def c_decl(self):
@@ -1473,12 +1484,11 @@ class TemplateClass:
         self.fundamental = cls.fundamental
         self.abstract = cls.abstract
 
-        md = markdown.Markdown(extensions=utils.MD_EXTENSIONS,
-                               extension_configs=utils.MD_EXTENSIONS_CONF)
+        md = utils.get_markdown()
 
-        if '.' in cls.name:
-            self.namespace = cls.name.split('.')[0]
-            self.name = cls.name.split('.')[1]
+        ns, sep, name = cls.name.partition('.')
+        if sep:
+            self.namespace, self.name = ns, name
             self.fqtn = cls.name
         else:
             self.namespace = namespace.name
@@ -1490,16 +1500,16 @@ class TemplateClass:
             self.parent_cname = 'GTypeInstance*'
             self.parent_name = 'TypeInstance'
             self.parent_namespace = 'GObject'
-        elif '.' in cls.parent.name:
-            self.parent_fqtn = cls.parent.name
-            self.parent_cname = cls.parent.ctype
-            self.parent_namespace = self.parent_fqtn.split('.')[0]
-            self.parent_name = self.parent_fqtn.split('.')[1]
         else:
             self.parent_cname = cls.parent.ctype
-            self.parent_name = cls.parent.name
-            self.parent_namespace = cls.parent.namespace or namespace.name
-            self.parent_fqtn = f"{self.parent_namespace}.{self.parent_name}"
+            ns, sep, name = cls.parent.name.partition('.')
+            if sep:
+                self.parent_fqtn = cls.parent.name
+                self.parent_namespace, self.parent_name = ns, name
+            else:
+                self.parent_name = cls.parent.name
+                self.parent_namespace = cls.parent.namespace or namespace.name
+                self.parent_fqtn = f"{self.parent_namespace}.{self.parent_name}"
 
         self.ancestors = []
         if recurse:
@@ -1507,12 +1517,7 @@ class TemplateClass:
                 self.ancestors.append(gen_index_ancestor(ancestor_type, namespace, config, md))
 
         if cls.descendants:
-            self.descendants = []
-            for descendant in cls.descendants:
-                self.descendants.append({
-                    'name': descendant.name,
-                    'ctype': descendant.ctype,
-                })
+            self.descendants = [TypeRef(descendant.name, descendant.ctype) for descendant in cls.descendants]
 
         self.class_name = cls.type_struct
 
@@ -1537,70 +1542,54 @@ class TemplateClass:
         if cls.doc is not None:
             self.summary = utils.preprocess_docs(cls.doc.content, namespace, summary=True, md=md)
             self.description = utils.preprocess_docs(cls.doc.content, namespace, md=md)
-            self.description_toc = md.toc_tokens is not None and md.toc_tokens.copy() or None
-            filename = cls.doc.filename
+            self.description_toc = md.toc_tokens or None
+            filename = _strip_parent_dirs(cls.doc.filename)
             line = cls.doc.line
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
         self.stability = cls.stability
         self.attributes = cls.attributes
         self.available_since = cls.available_since
         if cls.deprecated:
             (version, msg) = cls.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace, md=md),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace, md=md))
         else:
             self.deprecated_since = None
 
         self.introspectable = cls.introspectable
 
-        self.fields = []
-        if len(cls.fields) > 1:
-            # The first field is always the parent instance
-            for field in cls.fields[1:]:
-                if not field.private:
-                    self.fields.append(TemplateField(namespace, field))
+        # The first field is always the parent instance
+        self.fields = [TemplateField(namespace, field) for field in cls.fields[1:] if not field.private]
 
         self.properties = []
-        if len(cls.properties) != 0:
-            for pname, prop in cls.properties.items():
-                if not config.is_hidden(cls.name, "property", pname):
-                    self.properties.append(gen_index_property(prop, namespace, md))
+        for pname, prop in cls.properties.items():
+            if not config.is_hidden(cls.name, "property", pname):
+                self.properties.append(gen_index_property(prop, namespace, md))
 
         self.signals = []
-        if len(cls.signals) != 0:
-            for sname, signal in cls.signals.items():
-                if not config.is_hidden(cls.name, "signal", sname):
-                    self.signals.append(gen_index_signal(signal, namespace, md))
+        for sname, signal in cls.signals.items():
+            if not config.is_hidden(cls.name, "signal", sname):
+                self.signals.append(gen_index_signal(signal, namespace, md))
 
         self.ctors = []
-        if len(cls.constructors) != 0:
-            for ctor in cls.constructors:
-                if not config.is_hidden(cls.name, "constructor", ctor.name):
-                    self.ctors.append(gen_index_func(ctor, namespace, md))
+        for ctor in cls.constructors:
+            if not config.is_hidden(cls.name, "constructor", ctor.name):
+                self.ctors.append(gen_index_func(ctor, namespace, md))
 
         self.methods = []
-        if len(cls.methods) != 0:
-            for method in cls.methods:
-                if not config.is_hidden(cls.name, "method", method.name):
-                    self.methods.append(gen_index_func(method, namespace, md))
+        for method in cls.methods:
+            if not config.is_hidden(cls.name, "method", method.name):
+                self.methods.append(gen_index_func(method, namespace, md))
 
         if self.class_struct is not None:
             self.class_ctype = self.class_struct.ctype
             if self.class_struct.doc:
                 self.class_description = utils.preprocess_docs(self.class_struct.doc.content, namespace, md=md)
             else:
-                self.class_description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
-            self.class_fields = []
-            for field in self.class_struct.fields:
-                if not field.private:
-                    self.class_fields.append(TemplateField(namespace, field))
+                self.class_description = MISSING_DESCRIPTION_MARKUP
+            self.class_fields = [TemplateField(namespace, field) for field in self.class_struct.fields if not field.private]
             self.class_methods = []
             for method in self.class_struct.methods:
                 self.class_methods.append(gen_index_func(method, namespace, md))
@@ -1609,20 +1598,17 @@ class TemplateClass:
             self.class_methods = []
 
         self.interfaces = []
-        if len(cls.implements) != 0:
-            for iface_type in cls.implements:
-                self.interfaces.append(gen_index_implements(iface_type, namespace, config, md))
+        for iface_type in cls.implements:
+            self.interfaces.append(gen_index_implements(iface_type, namespace, config, md))
 
         self.virtual_methods = []
-        if len(cls.virtual_methods) != 0:
-            for vfunc in cls.virtual_methods:
-                self.virtual_methods.append(gen_index_func(vfunc, namespace, md))
+        for vfunc in cls.virtual_methods:
+            self.virtual_methods.append(gen_index_func(vfunc, namespace, md))
 
         self.type_funcs = []
-        if len(cls.functions) != 0:
-            for func in cls.functions:
-                if not config.is_hidden(cls.name, "function", func.name):
-                    self.type_funcs.append(gen_index_func(func, namespace, md))
+        for func in cls.functions:
+            if not config.is_hidden(cls.name, "function", func.name):
+                self.type_funcs.append(gen_index_func(func, namespace, md))
 
     @property
     def show_methods(self):
@@ -1672,19 +1658,19 @@ class TemplateClass:
         if n_interfaces:
             ifaces = [x['fqtn'] for x in self.interfaces]
             ifaces = ", ".join(ifaces)
-            res += [f"  implements {ifaces} {{"]
+            res.append(f"  implements {ifaces} {{")
         else:
-            res += ["{"]
+            res.append("{")
         n_fields = len(self.fields)
         if n_fields > 0:
             for (idx, field) in enumerate(self.fields):
                 if idx < n_fields - 1:
-                    res += [f"  {field.name}: {field.type_cname},"]
+                    res.append(f"  {field.name}: {field.type_cname},")
                 else:
-                    res += [f"  {field.name}: {field.type_cname}"]
+                    res.append(f"  {field.name}: {field.type_cname}")
         else:
-            res += ["  /* No available fields */"]
-        res += ["}"]
+            res.append("  /* No available fields */")
+        res.append("}")
         return "\n".join(res)
 
     @property
@@ -1753,57 +1739,45 @@ class TemplateRecord:
         self.namespace = record.name or namespace.name
         self.fqtn = f"{self.namespace}.{self.name}"
 
-        md = markdown.Markdown(extensions=utils.MD_EXTENSIONS,
-                               extension_configs=utils.MD_EXTENSIONS_CONF)
+        md = utils.get_markdown()
 
         if record.doc is not None:
             self.summary = utils.preprocess_docs(record.doc.content, namespace, summary=True, md=md)
             self.description = utils.preprocess_docs(record.doc.content, namespace, md=md)
-            self.description_toc = md.toc_tokens is not None and md.toc_tokens.copy() or None
-            filename = record.doc.filename
+            self.description_toc = md.toc_tokens or None
+            filename = _strip_parent_dirs(record.doc.filename)
             line = record.doc.line
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
         self.stability = record.stability
         self.attributes = record.attributes
         self.available_since = record.available_since
         if record.deprecated:
             (version, msg) = record.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace, md=md),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace, md=md))
         else:
             self.deprecated_since = None
 
         self.introspectable = record.introspectable
 
-        self.fields = []
-        for field in record.fields:
-            if not field.private:
-                self.fields.append(TemplateField(namespace, field))
+        self.fields = [TemplateField(namespace, field) for field in record.fields if not field.private]
 
         self.ctors = []
-        if len(record.constructors) != 0:
-            for ctor in record.constructors:
-                if not config.is_hidden(record.name, "constructor", ctor.name):
-                    self.ctors.append(gen_index_func(ctor, namespace, md))
+        for ctor in record.constructors:
+            if not config.is_hidden(record.name, "constructor", ctor.name):
+                self.ctors.append(gen_index_func(ctor, namespace, md))
 
         self.methods = []
-        if len(record.methods) != 0:
-            for method in record.methods:
-                if not config.is_hidden(record.name, "method", method.name):
-                    self.methods.append(gen_index_func(method, namespace, md))
+        for method in record.methods:
+            if not config.is_hidden(record.name, "method", method.name):
+                self.methods.append(gen_index_func(method, namespace, md))
 
         self.type_funcs = []
-        if len(record.functions) != 0:
-            for func in record.functions:
-                if not config.is_hidden(record.name, "function", func.name):
-                    self.type_funcs.append(gen_index_func(func, namespace, md))
+        for func in record.functions:
+            if not config.is_hidden(record.name, "function", func.name):
+                self.type_funcs.append(gen_index_func(func, namespace, md))
 
     @property
     def c_decl(self):
@@ -1812,14 +1786,14 @@ class TemplateRecord:
         if n_fields > 0:
             for field in self.fields:
                 if field.is_callback:
-                    res += [f"  {field.type_cname};"]
+                    res.append(f"  {field.type_cname};")
                 elif field.bits > 0:
-                    res += [f"  {field.type_cname} {field.name} : {field.bits};"]
+                    res.append(f"  {field.type_cname} {field.name} : {field.bits};")
                 else:
-                    res += [f"  {field.type_cname} {field.name};"]
+                    res.append(f"  {field.type_cname} {field.name};")
         else:
-            res += ["  /* No available fields */"]
-        res += ["}"]
+            res.append("  /* No available fields */")
+        res.append("}")
         return utils.code_highlight("\n".join(res))
 
 
@@ -1832,57 +1806,45 @@ class TemplateUnion:
         self.namespace = union.namespace or namespace.name
         self.fqtn = f"{self.namespace}.{self.name}"
 
-        md = markdown.Markdown(extensions=utils.MD_EXTENSIONS,
-                               extension_configs=utils.MD_EXTENSIONS_CONF)
+        md = utils.get_markdown()
 
         if union.doc is not None:
             self.summary = utils.preprocess_docs(union.doc.content, namespace, summary=True, md=md)
             self.description = utils.preprocess_docs(union.doc.content, namespace, md=md)
-            self.description_toc = md.toc_tokens is not None and md.toc_tokens.copy() or None
-            filename = union.doc.filename
+            self.description_toc = md.toc_tokens or None
+            filename = _strip_parent_dirs(union.doc.filename)
             line = union.doc.line
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
         self.stability = union.stability
         self.attributes = union.attributes
         self.available_since = union.available_since
         if union.deprecated:
             (version, msg) = union.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace, md=md),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace, md=md))
         else:
             self.deprecated_since = None
 
         self.introspectable = union.introspectable
 
-        self.fields = []
-        for field in union.fields:
-            if not field.private:
-                self.fields.append(TemplateField(namespace, field))
+        self.fields = [TemplateField(namespace, field) for field in union.fields if not field.private]
 
         self.ctors = []
-        if len(union.constructors) != 0:
-            for ctor in union.constructors:
-                if not config.is_hidden(union.name, "constructor", ctor.name):
-                    self.ctors.append(gen_index_func(ctor, namespace, md))
+        for ctor in union.constructors:
+            if not config.is_hidden(union.name, "constructor", ctor.name):
+                self.ctors.append(gen_index_func(ctor, namespace, md))
 
         self.methods = []
-        if len(union.methods) != 0:
-            for method in union.methods:
-                if not config.is_hidden(union.name, "method", method.name):
-                    self.methods.append(gen_index_func(method, namespace, md))
+        for method in union.methods:
+            if not config.is_hidden(union.name, "method", method.name):
+                self.methods.append(gen_index_func(method, namespace, md))
 
         self.type_funcs = []
-        if len(union.functions) != 0:
-            for func in union.functions:
-                if not config.is_hidden(union.name, "function", func.name):
-                    self.type_funcs.append(gen_index_func(func, namespace, md))
+        for func in union.functions:
+            if not config.is_hidden(union.name, "function", func.name):
+                self.type_funcs.append(gen_index_func(func, namespace, md))
 
     @property
     def c_decl(self):
@@ -1891,12 +1853,12 @@ class TemplateUnion:
         if n_fields > 0:
             for field in self.fields:
                 if field.is_callback:
-                    res += [f"  {field.type_cname};"]
+                    res.append(f"  {field.type_cname};")
                 else:
-                    res += [f"  {field.type_cname} {field.name};"]
+                    res.append(f"  {field.type_cname} {field.name};")
         else:
-            res += ["  /* No available fields */"]
-        res += ["}"]
+            res.append("  /* No available fields */")
+        res.append("}")
         return utils.code_highlight("\n".join(res))
 
 
@@ -1910,29 +1872,23 @@ class TemplateAlias:
         self.name = alias.name
         self.fqtn = f"{self.namespace}.{self.name}"
 
-        md = markdown.Markdown(extensions=utils.MD_EXTENSIONS,
-                               extension_configs=utils.MD_EXTENSIONS_CONF)
+        md = utils.get_markdown()
 
         if alias.doc is not None:
             self.summary = utils.preprocess_docs(alias.doc.content, namespace, summary=True, md=md)
             self.description = utils.preprocess_docs(alias.doc.content, namespace, md=md)
-            filename = alias.doc.filename
+            filename = _strip_parent_dirs(alias.doc.filename)
             line = alias.doc.line
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
         self.stability = alias.stability
         self.attributes = alias.attributes
         self.available_since = alias.available_since
         if alias.deprecated:
             (version, msg) = alias.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace))
         else:
             self.deprecated_since = None
 
@@ -1952,13 +1908,11 @@ class TemplateMember:
         self.available_since = member.available_since or enum.available_since
         if member.doc is not None:
             self.description = utils.preprocess_docs(member.doc.content, namespace)
-            filename = member.doc.filename
+            filename = _strip_parent_dirs(member.doc.filename)
             line = member.doc.line
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
 
 class TemplateEnum:
@@ -1973,29 +1927,23 @@ class TemplateEnum:
         self.name = enum.name
         self.fqtn = f"{namespace.name}.{enum.name}"
 
-        md = markdown.Markdown(extensions=utils.MD_EXTENSIONS,
-                               extension_configs=utils.MD_EXTENSIONS_CONF)
+        md = utils.get_markdown()
 
         if enum.doc is not None:
             self.summary = utils.preprocess_docs(enum.doc.content, namespace, summary=True, md=md)
             self.description = utils.preprocess_docs(enum.doc.content, namespace, md=md)
-            filename = enum.doc.filename
+            filename = _strip_parent_dirs(enum.doc.filename)
             line = enum.doc.line
-            if filename.startswith('../'):
-                filename = filename.replace('../', '')
-            self.docs_location = (filename, line)
+            self.docs_location = DocsLocation(filename, line)
         else:
-            self.description = Markup(f"<p>{MISSING_DESCRIPTION}</p>")
+            self.description = MISSING_DESCRIPTION_MARKUP
 
         self.stability = enum.stability
         self.attributes = enum.attributes
         self.available_since = enum.available_since
         if enum.deprecated:
             (version, msg) = enum.deprecated_since
-            self.deprecated_since = {
-                "version": version,
-                "message": utils.preprocess_docs(msg, namespace, md=md),
-            }
+            self.deprecated_since = DeprecationInfo(version, utils.preprocess_docs(msg, namespace, md=md))
         else:
             self.deprecated_since = None
 
@@ -2042,6 +1990,7 @@ class TemplateNamespace:
 
 def _gen_classes(config, theme_config, output_dir, jinja_env, repository, all_classes):
     namespace = repository.namespace
+    out_prefix = output_dir.rstrip(os.sep) + os.sep
 
     class_tmpl = jinja_env.get_template(theme_config.class_template)
     method_tmpl = jinja_env.get_template(theme_config.method_template)
@@ -2058,7 +2007,7 @@ def _gen_classes(config, theme_config, output_dir, jinja_env, repository, all_cl
         if config.is_hidden(cls.name):
             log.debug(f"Skipping hidden class {cls.name}")
             continue
-        class_file = os.path.join(output_dir, f"class.{cls.name}.html")
+        class_file = f"{out_prefix}class.{cls.name}.html"
         log.info(f"Creating class file for {namespace.name}.{cls.name}: {class_file}")
 
         tmpl = TemplateClass(namespace, cls, config)
@@ -2150,18 +2099,27 @@ def _gen_classes(config, theme_config, output_dir, jinja_env, repository, all_cl
             },
         ]
 
-        if config.show_class_hierarchy:
+        # The hierarchy is only shown for classes with ancestors or interfaces,
+        # so we can avoid running dot for the others
+        if (tmpl.ancestors or tmpl.interfaces) and config.show_class_hierarchy:
             tmpl.hierarchy_svg = utils.render_dot(tmpl.dot, output_format="svg")
 
-        with open(class_file, "w", encoding="utf-8") as out:
-            content = class_tmpl.render({
+        with open(class_file, "w", encoding="utf-8", buffering=PAGE_BUFFER_SIZE) as out:
+            class_tmpl.stream({
                 'CONFIG': config,
                 'namespace': namespace,
                 'class': tmpl,
                 'sections': sections,
-            })
-
-            out.write(content)
+            }).dump(out)
+
+        # Only the symbol changes between the pages of a section, and Jinja
+        # copies the context when rendering, so we can update it in place
+        sym_context = {
+            'CONFIG': config,
+            'namespace': namespace,
+            'class': tmpl,
+            'sections': sections,
+        }
 
         for section in sections:
             for sym in section['symbols']:
@@ -2170,23 +2128,22 @@ def _gen_classes(config, theme_config, output_dir, jinja_env, repository, all_cl
                     continue
 
                 s = section['template_class'](namespace, cls, sym)
-                sym_file = os.path.join(output_dir, f"{section['section_fragment']}.{cls.name}.{sym.name}.html")
+                sym_file = f"{out_prefix}{section['section_fragment']}.{cls.name}.{sym.name}.html"
                 log.debug(f"Creating symbol file for {namespace.name}.{cls.name}.{sym.name}: {sym_file}")
 
-                with open(sym_file, "w", encoding="utf-8") as out:
-                    out.write(section['template_renderer'].render({
-                        'CONFIG': config,
-                        'namespace': namespace,
-                        'class': tmpl,
-                        'sections': sections,
-                        section['template']: s,
-                    }))
+                sym_context[section['template']] = s
+
+                with open(sym_file, "w", encoding="utf-8", buffering=PAGE_BUFFER_SIZE) as out:
+                    section['template_renderer'].stream(sym_context).dump(out)
+
+            sym_context.pop(section['template'], None)
 
     return template_classes
 
 
 def _gen_interfaces(config, theme_config, output_dir, jinja_env, repository, all_interfaces):
     namespace = repository.namespace
+    out_prefix = output_dir.rstrip(os.sep) + os.sep
 
     iface_tmpl = jinja_env.get_template(theme_config.interface_template)
     method_tmpl = jinja_env.get_template(theme_config.method_template)
@@ -2202,7 +2159,7 @@ def _gen_interfaces(config, theme_config, output_dir, jinja_env, repository, all
         if config.is_hidden(iface.name):
             log.debug(f"Skipping hidden interface {iface.name}")
             continue
-        iface_file = os.path.join(output_dir, f"iface.{iface.name}.html")
+        iface_file = f"{out_prefix}iface.{iface.name}.html"
         log.info(f"Creating interface file for {namespace.name}.{iface.name}: {iface_file}")
 
         tmpl = TemplateInterface(namespace, iface, config)
@@ -2283,13 +2240,22 @@ def _gen_interfaces(config, theme_config, output_dir, jinja_env, repository, all
             },
         ]
 
-        with open(iface_file, "w", encoding="utf-8") as out:
-            out.write(iface_tmpl.render({
+        with open(iface_file, "w", encoding="utf-8", buffering=PAGE_BUFFER_SIZE) as out:
+            iface_tmpl.stream({
                 'CONFIG': config,
                 'namespace': namespace,
                 'interface': tmpl,
                 'sections': sections,
-            }))
+            }).dump(out)
+
+        # Only the symbol changes between the pages of a section, and Jinja
+        # copies the context when rendering, so we can update it in place
+        sym_context = {
+            'CONFIG': config,
+            'namespace': namespace,
+            'class': tmpl,
+            'sections': sections,
+        }
 
         for section in sections:
             for sym in section['symbols']:
@@ -2298,45 +2264,46 @@ def _gen_interfaces(config, theme_config, output_dir, jinja_env, repository, all
                     continue
 
                 s = section['template_class'](namespace, iface, sym)
-                sym_file = os.path.join(output_dir, f"{section['section_fragment']}.{iface.name}.{sym.name}.html")
+                sym_file = f"{out_prefix}{section['section_fragment']}.{iface.name}.{sym.name}.html"
                 log.debug(f"Creating symbol file for {namespace.name}.{iface.name}.{sym.name}: {sym_file}")
 
-                with open(sym_file, "w", encoding="utf-8") as out:
-                    out.write(section['template_renderer'].render({
-                        'CONFIG': config,
-                        'namespace': namespace,
-                        'class': tmpl,
-                        'sections': sections,
-                        section['template']: s,
-                    }))
+                sym_context[section['template']] = s
+
+                with open(sym_file, "w", encoding="utf-8", buffering=PAGE_BUFFER_SIZE) as out:
+                    section['template_renderer'].stream(sym_context).dump(out)
+
+            sym_context.pop(section['template'], None)
 
     return template_interfaces
 
 
-def _gen_enums(config, theme_config, output_dir, jinja_env, repository, all_enums):
+def _gen_enum_types(config, theme_config, output_dir, jinja_env, repository, all_enums, template_name, kind, fragment):
+    # Enumerations, bitfields, and error domains only differ in their
+    # template and in the prefix of their files
     namespace = repository.namespace
+    out_prefix = output_dir.rstrip(os.sep) + os.sep
 
-    enum_tmpl = jinja_env.get_template(theme_config.enum_template)
+    enum_tmpl = jinja_env.get_template(getattr(theme_config, template_name))
     type_func_tmpl = jinja_env.get_template(theme_config.type_func_template)
 
     template_enums = []
 
     for enum in all_enums:
         if config.is_hidden(enum.name):
-            log.debug(f"Skipping hidden enum {enum.name}")
+            log.debug(f"Skipping hidden {kind} {enum.name}")
             continue
-        enum_file = os.path.join(output_dir, f"enum.{enum.name}.html")
+        enum_file = f"{out_prefix}{fragment}.{enum.name}.html"
         log.info(f"Creating enum file for {namespace.name}.{enum.name}: {enum_file}")
 
         tmpl = TemplateEnum(namespace, enum, config)
         template_enums.append(tmpl)
 
         with open(enum_file, "w", encoding="utf-8") as out:
-            out.write(enum_tmpl.render({
+            enum_tmpl.stream({
                 'CONFIG': config,
                 'namespace': namespace,
                 'enum': tmpl,
-            }))
+            }).dump(out)
 
         for type_func in enum.functions:
             if config.is_hidden(enum.name, "enum", type_func.name):
@@ -2344,112 +2311,38 @@ def _gen_enums(config, theme_config, output_dir, jinja_env, repository, all_enum
                 continue
 
             f = TemplateFunction(namespace, enum, type_func)
-            type_func_file = os.path.join(output_dir, f"type_func.{enum.name}.{type_func.name}.html")
+            type_func_file = f"{out_prefix}type_func.{enum.name}.{type_func.name}.html"
             log.debug(f"Creating type func file for {namespace.name}.{enum.name}.{type_func.name}: {type_func_file}")
 
             with open(type_func_file, "w", encoding="utf-8") as out:
-                out.write(type_func_tmpl.render({
+                type_func_tmpl.stream({
                     'CONFIG': config,
                     'namespace': namespace,
                     'class': tmpl,
                     'type_func': f,
-                }))
+                }).dump(out)
 
     return template_enums
 
 
-def _gen_bitfields(config, theme_config, output_dir, jinja_env, repository, all_enums):
-    namespace = repository.namespace
-
-    enum_tmpl = jinja_env.get_template(theme_config.flags_template)
-    type_func_tmpl = jinja_env.get_template(theme_config.type_func_template)
-
-    template_bitfields = []
-
-    for enum in all_enums:
-        if config.is_hidden(enum.name):
-            log.debug(f"Skipping hidden bitfield {enum.name}")
-            continue
-        enum_file = os.path.join(output_dir, f"flags.{enum.name}.html")
-        log.info(f"Creating enum file for {namespace.name}.{enum.name}: {enum_file}")
-
-        tmpl = TemplateEnum(namespace, enum, config)
-        template_bitfields.append(tmpl)
-
-        with open(enum_file, "w", encoding="utf-8") as out:
-            out.write(enum_tmpl.render({
-                'CONFIG': config,
-                'namespace': namespace,
-                'enum': tmpl,
-            }))
-
-        for type_func in enum.functions:
-            if config.is_hidden(enum.name, "enum", type_func.name):
-                log.debug(f"Skipping hidden symbol {enum.name}.{type_func.name}")
-                continue
-
-            f = TemplateFunction(namespace, enum, type_func)
-            type_func_file = os.path.join(output_dir, f"type_func.{enum.name}.{type_func.name}.html")
-            log.debug(f"Creating type func file for {namespace.name}.{enum.name}.{type_func.name}: {type_func_file}")
+def _gen_enums(config, theme_config, output_dir, jinja_env, repository, all_enums):
+    return _gen_enum_types(config, theme_config, output_dir, jinja_env, repository, all_enums,
+                           "enum_template", "enum", "enum")
 
-            with open(type_func_file, "w", encoding="utf-8") as out:
-                out.write(type_func_tmpl.render({
-                    'CONFIG': config,
-                    'namespace': namespace,
-                    'class': tmpl,
-                    'type_func': f,
-                }))
 
-    return template_bitfields
+def _gen_bitfields(config, theme_config, output_dir, jinja_env, repository, all_enums):
+    return _gen_enum_types(config, theme_config, output_dir, jinja_env, repository, all_enums,
+                           "flags_template", "bitfield", "flags")
 
 
 def _gen_domains(config, theme_config, output_dir, jinja_env, repository, all_enums):
-    namespace = repository.namespace
-
-    enum_tmpl = jinja_env.get_template(theme_config.error_template)
-    type_func_tmpl = jinja_env.get_template(theme_config.type_func_template)
-
-    template_domains = []
-
-    for enum in all_enums:
-        if config.is_hidden(enum.name):
-            log.debug(f"Skipping hidden domain {enum.name}")
-            continue
-        enum_file = os.path.join(output_dir, f"error.{enum.name}.html")
-        log.info(f"Creating enum file for {namespace.name}.{enum.name}: {enum_file}")
-
-        tmpl = TemplateEnum(namespace, enum, config)
-        template_domains.append(tmpl)
-
-        with open(enum_file, "w", encoding="utf-8") as out:
-            out.write(enum_tmpl.render({
-                'CONFIG': config,
-                'namespace': namespace,
-                'enum': tmpl,
-            }))
-
-        for type_func in enum.functions:
-            if config.is_hidden(enum.name, "enum", type_func.name):
-                log.debug(f"Skipping hidden symbol {enum.name}.{type_func.name}")
-                continue
-
-            f = TemplateFunction(namespace, enum, type_func)
-            type_func_file = os.path.join(output_dir, f"type_func.{enum.name}.{type_func.name}.html")
-            log.debug(f"Creating type func file for {namespace.name}.{enum.name}.{type_func.name}: {type_func_file}")
-
-            with open(type_func_file, "w", encoding="utf-8") as out:
-                out.write(type_func_tmpl.render({
-                    'CONFIG': config,
-                    'namespace': namespace,
-                    'class': tmpl,
-                    'type_func': f,
-                }))
-
-    return template_domains
+    return _gen_enum_types(config, theme_config, output_dir, jinja_env, repository, all_enums,
+                           "error_template", "domain", "error")
 
 
 def _gen_constants(config, theme_config, output_dir, jinja_env, repository, all_constants):
     namespace = repository.namespace
+    out_prefix = output_dir.rstrip(os.sep) + os.sep
 
     const_tmpl = jinja_env.get_template(theme_config.constant_template)
 
@@ -2459,24 +2352,25 @@ def _gen_constants(config, theme_config, output_dir, jinja_env, repository, all_
         if config.is_hidden(const.name):
             log.debug(f"Skipping hidden constant {const.name}")
             continue
-        const_file = os.path.join(output_dir, f"const.{const.name}.html")
+        const_file = f"{out_prefix}const.{const.name}.html"
         log.info(f"Creating constant file for {namespace.name}.{const.name}: {const_file}")
 
         tmpl = TemplateConstant(namespace, const)
         template_constants.append(tmpl)
 
         with open(const_file, "w", encoding="utf-8") as out:
-            out.write(const_tmpl.render({
+            const_tmpl.stream({
                 'CONFIG': config,
                 'namespace': namespace,
                 'constant': tmpl,
-            }))
+            }).dump(out)
 
     return template_constants
 
 
 def _gen_aliases(config, theme_config, output_dir, jinja_env, repository, all_aliases):
     namespace = repository.namespace
+    out_prefix = output_dir.rstrip(os.sep) + os.sep
 
     alias_tmpl = jinja_env.get_template(theme_config.alias_template)
 
@@ -2486,26 +2380,25 @@ def _gen_aliases(config, theme_config, output_dir, jinja_env, repository, all_al
         if config.is_hidden(alias.name):
             log.debug(f"Skipping hidden alias {alias.name}")
             continue
-        alias_file = os.path.join(output_dir, f"alias.{alias.name}.html")
+        alias_file = f"{out_prefix}alias.{alias.name}.html"
         log.info(f"Creating alias file for {namespace.name}.{alias.name}: {alias_file}")
 
         tmpl = TemplateAlias(namespace, alias)
         template_aliases.append(tmpl)
 
         with open(alias_file, "w", encoding="utf-8") as out:
-            content = alias_tmpl.render({
+            alias_tmpl.stream({
                 'CONFIG': config,
                 'namespace': namespace,
                 'struct': tmpl,
-            })
-
-            out.write(content)
+            }).dump(out)
 
     return template_aliases
 
 
 def _gen_records(config, theme_config, output_dir, jinja_env, repository, all_records):
     namespace = repository.namespace
+    out_prefix = output_dir.rstrip(os.sep) + os.sep
 
     record_tmpl = jinja_env.get_template(theme_config.record_template)
     method_tmpl = jinja_env.get_template(theme_config.method_template)
@@ -2517,7 +2410,7 @@ def _gen_records(config, theme_config, output_dir, jinja_env, repository, all_re
         if config.is_hidden(record.name):
             log.debug(f"Skipping hidden record {record.name}")
             continue
-        record_file = os.path.join(output_dir, f"struct.{record.name}.html")
+        record_file = f"{out_prefix}struct.{record.name}.html"
         log.info(f"Creating record file for {namespace.name}.{record.name}: {record_file}")
 
         tmpl = TemplateRecord(namespace, record, config)
@@ -2559,15 +2452,22 @@ def _gen_records(config, theme_config, output_dir, jinja_env, repository, all_re
             },
         ]
 
-        with open(record_file, "w", encoding="utf-8") as out:
-            content = record_tmpl.render({
+        with open(record_file, "w", encoding="utf-8", buffering=PAGE_BUFFER_SIZE) as out:
+            record_tmpl.stream({
                 'CONFIG': config,
                 'namespace': namespace,
                 'struct': tmpl,
                 'sections': sections,
-            })
-
-            out.write(content)
+            }).dump(out)
+
+        # Only the symbol changes between the pages of a section, and Jinja
+        # copies the context when rendering, so we can update it in place
+        sym_context = {
+            'CONFIG': config,
+            'namespace': namespace,
+            'class': tmpl,
+            'sections': sections,
+        }
 
         for section in sections:
             for sym in section['symbols']:
@@ -2576,23 +2476,22 @@ def _gen_records(config, theme_config, output_dir, jinja_env, repository, all_re
                     continue
 
                 s = section['template_class'](namespace, record, sym)
-                sym_file = os.path.join(output_dir, f"{section['section_fragment']}.{record.name}.{sym.name}.html")
+                sym_file = f"{out_prefix}{section['section_fragment']}.{record.name}.{sym.name}.html"
                 log.debug(f"Creating symbol file for {namespace.name}.{record.name}.{sym.name}: {sym_file}")
 
-                with open(sym_file, "w", encoding="utf-8") as out:
-                    out.write(section['template_renderer'].render({
-                        'CONFIG': config,
-                        'namespace': namespace,
-                        'class': tmpl,
-                        'sections': sections,
-                        section['template']: s,
-                    }))
+                sym_context[section['template']] = s
+
+                with open(sym_file, "w", encoding="utf-8", buffering=PAGE_BUFFER_SIZE) as out:
+                    section['template_renderer'].stream(sym_context).dump(out)
+
+            sym_context.pop(section['template'], None)
 
     return template_records
 
 
 def _gen_unions(config, theme_config, output_dir, jinja_env, repository, all_unions):
     namespace = repository.namespace
+    out_prefix = output_dir.rstrip(os.sep) + os.sep
 
     union_tmpl = jinja_env.get_template(theme_config.union_template)
     method_tmpl = jinja_env.get_template(theme_config.method_template)
@@ -2604,7 +2503,7 @@ def _gen_unions(config, theme_config, output_dir, jinja_env, repository, all_uni
         if config.is_hidden(union.name):
             log.debug(f"Skipping hidden union {union.name}")
             continue
-        union_file = os.path.join(output_dir, f"union.{union.name}.html")
+        union_file = f"{out_prefix}union.{union.name}.html"
         log.info(f"Creating union file for {namespace.name}.{union.name}: {union_file}")
 
         tmpl = TemplateUnion(namespace, union, config)
@@ -2646,15 +2545,22 @@ def _gen_unions(config, theme_config, output_dir, jinja_env, repository, all_uni
             },
         ]
 
-        with open(union_file, "w", encoding="utf-8") as out:
-            content = union_tmpl.render({
+        with open(union_file, "w", encoding="utf-8", buffering=PAGE_BUFFER_SIZE) as out:
+            union_tmpl.stream({
                 'CONFIG': config,
                 'namespace': namespace,
                 'struct': tmpl,
                 'sections': sections,
-            })
-
-            out.write(content)
+            }).dump(out)
+
+        # Only the symbol changes between the pages of a section, and Jinja
+        # copies the context when rendering, so we can update it in place
+        sym_context = {
+            'CONFIG': config,
+            'namespace': namespace,
+            'class': tmpl,
+            'sections': sections,
+        }
 
         for section in sections:
             for sym in section['symbols']:
@@ -2663,23 +2569,22 @@ def _gen_unions(config, theme_config, output_dir, jinja_env, repository, all_uni
                     continue
 
                 s = section['template_class'](namespace, union, sym)
-                sym_file = os.path.join(output_dir, f"{section['section_fragment']}.{union.name}.{sym.name}.html")
+                sym_file = f"{out_prefix}{section['section_fragment']}.{union.name}.{sym.name}.html"
                 log.debug(f"Creating symbol file for {namespace.name}.{union.name}.{sym.name}: {sym_file}")
 
-                with open(sym_file, "w", encoding="utf-8") as out:
-                    out.write(section['template_renderer'].render({
-                        'CONFIG': config,
-                        'namespace': namespace,
-                        'class': tmpl,
-                        'sections': sections,
-                        section['template']: s,
-                    }))
+                sym_context[section['template']] = s
+
+                with open(sym_file, "w", encoding="utf-8", buffering=PAGE_BUFFER_SIZE) as out:
+                    section['template_renderer'].stream(sym_context).dump(out)
+
+            sym_context.pop(section['template'], None)
 
     return template_unions
 
 
 def _gen_functions(config, theme_config, output_dir, jinja_env, repository, all_functions):
     namespace = repository.namespace
+    out_prefix = output_dir.rstrip(os.sep) + os.sep
 
     func_tmpl = jinja_env.get_template(theme_config.func_template)
 
@@ -2689,26 +2594,25 @@ def _gen_functions(config, theme_config, output_dir, jinja_env, repository, all_
         if config.is_hidden(func.name):
             log.debug(f"Skipping hidden function {func.name}")
             continue
-        func_file = os.path.join(output_dir, f"func.{func.name}.html")
+        func_file = f"{out_prefix}func.{func.name}.html"
         log.info(f"Creating function file for {namespace.name}.{func.name}: {func_file}")
 
         tmpl = TemplateFunction(namespace, None, func)
         template_functions.append(tmpl)
 
         with open(func_file, "w", encoding="utf-8") as out:
-            content = func_tmpl.render({
+            func_tmpl.stream({
                 'CONFIG': config,
                 'namespace': namespace,
                 'func': tmpl,
-            })
-
-            out.write(content)
+            }).dump(out)
 
     return template_functions
 
 
 def _gen_callbacks(config, theme_config, output_dir, jinja_env, repository, all_callbacks):
     namespace = repository.namespace
+    out_prefix = output_dir.rstrip(os.sep) + os.sep
 
     func_tmpl = jinja_env.get_template(theme_config.func_template)
 
@@ -2718,26 +2622,25 @@ def _gen_callbacks(config, theme_config, output_dir, jinja_env, repository, all_
         if config.is_hidden(func.name):
             log.debug(f"Skipping hidden callback {func.name}")
             continue
-        func_file = os.path.join(output_dir, f"callback.{func.name}.html")
+        func_file = f"{out_prefix}callback.{func.name}.html"
         log.info(f"Creating callback file for {namespace.name}.{func.name}: {func_file}")
 
         tmpl = TemplateCallback(namespace, func)
         template_callbacks.append(tmpl)
 
         with open(func_file, "w", encoding="utf-8") as out:
-            content = func_tmpl.render({
+            func_tmpl.stream({
                 'CONFIG': config,
                 'namespace': namespace,
                 'func': tmpl,
-            })
-
-            out.write(content)
+            }).dump(out)
 
     return template_callbacks
 
 
 def _gen_function_macros(config, theme_config, output_dir, jinja_env, repository, all_functions):
     namespace = repository.namespace
+    out_prefix = output_dir.rstrip(os.sep) + os.sep
 
     func_tmpl = jinja_env.get_template(theme_config.func_template)
 
@@ -2747,20 +2650,18 @@ def _gen_function_macros(config, theme_config, output_dir, jinja_env, repository
         if config.is_hidden(func.name):
             log.debug(f"Skipping hidden macro {func.name}")
             continue
-        func_file = os.path.join(output_dir, f"func.{func.name}.html")
+        func_file = f"{out_prefix}func.{func.name}.html"
         log.info(f"Creating function macro file for {namespace.name}.{func.name}: {func_file}")
 
         tmpl = TemplateFunction(namespace, None, func)
         template_functions.append(tmpl)
 
         with open(func_file, "w", encoding="utf-8") as out:
-            content = func_tmpl.render({
+            func_tmpl.stream({
                 'CONFIG': config,
                 'namespace': namespace,
                 'func': tmpl,
-            })
-
-            out.write(content)
+            }).dump(out)
 
     return template_functions
 
@@ -2769,17 +2670,13 @@ def gen_content_files(config, theme_config, content_dirs, output_dir, jinja_env,
     content_files = []
 
     content_tmpl = jinja_env.get_template(theme_config.content_template)
-    md = markdown.Markdown(extensions=utils.MD_EXTENSIONS, extension_configs=utils.MD_EXTENSIONS_CONF)
+    md = utils.get_markdown()
 
     for file_name in config.content_files:
         src_file = utils.find_extra_content_file(content_dirs, file_name)
 
-        src_data = ""
         with open(src_file, encoding='utf-8') as infile:
-            source = []
-            for line in infile:
-                source.append(line)
-            src_data = "".join(source)
+            src_data = infile.read()
 
         dst_data = utils.preprocess_docs(src_data, namespace, md=md)
         title = "\n".join(md.Meta.get("title", ["Unknown document"]))
@@ -2802,11 +2699,11 @@ def gen_content_files(config, theme_config, content_dirs, output_dir, jinja_env,
 
         log.info(f"Generating content file {file_name}: {dst_file}")
         with open(dst_file, "w", encoding='utf-8') as outfile:
-            outfile.write(content_tmpl.render({
+            content_tmpl.stream({
                 "CONFIG": config,
                 "namespace": namespace,
                 "content": content,
-            }))
+            }).dump(outfile)
 
         content_files.append({
             "title": title,
@@ -2825,7 +2722,7 @@ def gen_content_images(config, content_dirs, output_dir):
         infile = utils.find_extra_content_file(content_dirs, image_file)
         outfile = os.path.join(output_dir, os.path.basename(image_file))
         log.debug(f"Adding extra content image: {infile} -> {outfile}")
-        content_images += [(infile, outfile)]
+        content_images.append((infile, outfile))
 
     return content_images
 
@@ -2843,39 +2740,36 @@ def gen_types_hierarchy(config, theme_config, output_dir, jinja_env, repository)
     res = ["<h1>Classes Hierarchy</h1>"]
 
     def dump_tree(node, out):
-        for k in node:
-            if '.' in k:
-                ns, name = k.split('.', 2)
-                data_ns = f'data-namespace="{ns}"'
-                data_link = f'data-link="class.{name}.html"'
-                href = 'href="javascript:void(0)"'
-                css_class = 'class="external"'
-                out.append(f'<li class="type"><a {data_ns} {data_link} {href} {css_class}><code>{k}</code></a>')
+        for k, children in node.items():
+            ns, sep, name = k.partition('.')
+            if sep:
+                out.append(f'<li class="type"><a data-namespace="{ns}" data-link="class.{name}.html" '
+                           f'href="javascript:void(0)" class="external"><code>{k}</code></a>')
             else:
                 out.append(f'<li class="type"><a href="class.{k}.html"><code>{k}</code></a>')
-            if len(node[k]) != 0:
+            if len(children) != 0:
                 out.append('<ul class="type">')
-                dump_tree(node[k], out)
+                dump_tree(children, out)
                 out.append("</ul>")
             out.append("</li>")
 
     if len(objects_tree) != 0:
-        res += ["<div class=\"docblock\">"]
-        res += ["<ul class=\"type root\">"]
-        res += [" <li class=\"type\"><a data-namespace=\"GObject\" data-link=\"class.Object.html\" href=\"javascript:void(0)\" class=\"external\"><code>GObject.Object</code></a></li><ul class=\"type\">"]  # noqa: E501
+        res.append("<div class=\"docblock\">")
+        res.append("<ul class=\"type root\">")
+        res.append(" <li class=\"type\"><a data-namespace=\"GObject\" data-link=\"class.Object.html\" href=\"javascript:void(0)\" class=\"external\"><code>GObject.Object</code></a></li><ul class=\"type\">")  # noqa: E501
         dump_tree(objects_tree, res)
-        res += [" </ul></li>"]
-        res += ["</ul>"]
-        res += ["</div>"]
+        res.append(" </ul></li>")
+        res.append("</ul>")
+        res.append("</div>")
 
     if len(typed_tree) != 0:
-        res += ["<div class=\"docblock\">"]
-        res += ["<ul class=\"type root\">"]
-        res += [" <li class=\"type\"><a data-namespace=\"GObject\" data-link=\"struct.TypeInstance.html\" href=\"javascript:void(0)\" class=\"external\"><code>GObject.TypeInstance</code></li><ul class=\"type\">"]  # noqa: E501
+        res.append("<div class=\"docblock\">")
+        res.append("<ul class=\"type root\">")
+        res.append(" <li class=\"type\"><a data-namespace=\"GObject\" data-link=\"struct.TypeInstance.html\" href=\"javascript:void(0)\" class=\"external\"><code>GObject.TypeInstance</code></li><ul class=\"type\">")  # noqa: E501
         dump_tree(typed_tree, res)
-        res += [" </ul></li>"]
-        res += ["</ul>"]
-        res += ["</div>"]
+        res.append(" </ul></li>")
+        res.append("</ul>")
+        res.append("</div>")
 
     content = {
         "output_file": "classes_hierarchy.html",
@@ -2893,11 +2787,11 @@ def gen_types_hierarchy(config, theme_config, output_dir, jinja_env, repository)
     dst_file = os.path.join(output_dir, content["output_file"])
     log.info(f"Generating type hierarchy file: {dst_file}")
     with open(dst_file, "w", encoding="utf-8") as outfile:
-        outfile.write(content_tmpl.render({
+        content_tmpl.stream({
             "CONFIG": config,
             "namespace": namespace,
             "content": content,
-        }))
+        }).dump(outfile)
 
     return {
         "title": content["title"],
@@ -2973,8 +2867,8 @@ def gen_devhelp(config, repository, namespace, symbols, content_files):
                 keyword.set("link", f"func.{t.name}.html")
                 if t.available_since is not None:
                     keyword.set("since", t.available_since)
-                if t.deprecated_since is not None and t.deprecated_since["version"] is not None:
-                    keyword.set("deprecated", t.deprecated_since["version"])
+                if t.deprecated_since is not None and t.deprecated_since.version is not None:
+                    keyword.set("deprecated", t.deprecated_since.version)
                 continue
 
             if section == "constants":
@@ -2984,8 +2878,8 @@ def gen_devhelp(config, repository, namespace, symbols, content_files):
                 keyword.set("link", f"const.{t.name}.html")
                 if t.available_since is not None:
                     keyword.set("since", t.available_since)
-                if t.deprecated_since is not None and t.deprecated_since["version"] is not None:
-                    keyword.set("deprecated", t.deprecated_since["version"])
+                if t.deprecated_since is not None and t.deprecated_since.version is not None:
+                    keyword.set("deprecated", t.deprecated_since.version)
                 continue
 
             if section in ["aliases", "bitfields", "classes", "domains", "enums", "interfaces", "structs", "unions"]:
@@ -3005,8 +2899,8 @@ def gen_devhelp(config, repository, namespace, symbols, content_files):
                 keyword.set("link", f"{FRAGMENT[section]}.{t.name}.html")
                 if t.available_since is not None:
                     keyword.set("since", t.available_since)
-                if t.deprecated_since is not None and t.deprecated_since["version"] is not None:
-                    keyword.set("deprecated", t.deprecated_since["version"])
+                if t.deprecated_since is not None and t.deprecated_since.version is not None:
+                    keyword.set("deprecated", t.deprecated_since.version)
 
             for m in getattr(t, "members", []):
                 keyword = etree.SubElement(functions, "keyword")
@@ -3096,12 +2990,29 @@ def gen_devhelp(config, repository, namespace, symbols, content_files):
     return etree.ElementTree(book)
 
 
+def _get_bytecode_cache():
+    # Compiling the templates is a noticeable part of the run time, so we
+    # store their bytecode across invocations; Jinja checks the source of
+    # each template before reusing its cached bytecode
+    if os.environ.get("GIDOCGEN_NO_CACHE"):
+        return None
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    cache_dir = os.path.join(cache_home, "gi-docgen", "templates")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError as e:
+        log.debug(f"Could not create templates cache {cache_dir}: {e}")
+        return None
+    return jinja2.FileSystemBytecodeCache(cache_dir)
+
+
 def gen_reference(config, options, repository, templates_dir, theme_config, content_dirs, output_dir):
     theme_dir = os.path.join(templates_dir, theme_config.name.lower())
     log.debug(f"Loading jinja templates from {theme_dir}")
 
     fs_loader = jinja2.FileSystemLoader(theme_dir)
-    jinja_env = jinja2.Environment(loader=fs_loader, autoescape=jinja2.select_autoescape(['html']))
+    jinja_env = jinja2.Environment(loader=fs_loader, autoescape=jinja2.select_autoescape(['html']),
+                                   bytecode_cache=_get_bytecode_cache())
 
     namespace = repository.namespace
 
@@ -3189,6 +3100,15 @@ def gen_reference(config, options, repository, templates_dir, theme_config, cont
             else:
                 template_symbols[section] = res
 
+    # The cached type links and documentation hold on to the repository, and
+    # the cached index entries depend on the configuration, so drop them once
+    # all the sections have been generated
+    log.debug(f"Type links: {gen_type_link.cache_info()}")
+    gen_type_link.cache_clear()
+    utils.clear_docs_cache()
+    _index_ancestors.clear()
+    _index_implements.clear()
+
     # The concurrent processing introduces non-determinism. Ensure iteration order is reproducible
     # by sorting by key. This has virtually no overhead since the values are not copied.
     template_symbols = dict(sorted(template_symbols.items()))
@@ -3197,13 +3117,13 @@ def gen_reference(config, options, repository, templates_dir, theme_config, cont
     ns_file = os.path.join(ns_dir, "index.html")
     log.info(f"Creating namespace index file for {namespace.name}-{namespace.version}: {ns_file}")
     with open(ns_file, "w", encoding="utf-8") as out:
-        out.write(ns_tmpl.render({
+        ns_tmpl.stream({
             "CONFIG": config,
             "repository": repository,
             "namespace": namespace,
             "symbols": template_symbols,
             "content_files": content_files,
-        }))
+        }).dump(out)
 
     if config.devhelp:
         # Devhelp expects the book file to have the same basename as the directory it is in.
@@ -1,10 +1,14 @@
 # SPDX-FileCopyrightText: 2020 GNOME Foundation
 # SPDX-License-Identifier: Apache-2.0 OR GPL-3.0-or-later
 
+import sys
 import typing as T
 
 from .. import log
 
+# Marks a lookup that has not been cached yet, since None is a valid result
+_MISSING = object()
+
 
 class Doc:
     """A documentation node, pointing to the source code"""
@@ -77,11 +81,13 @@ class Info:
 class GIRElement:
     """Base type for elements inside the GIR"""
     def __init__(self, name: T.Optional[str] = None, namespace: T.Optional[str] = None):
-        self.name = name
-        self.namespace = namespace
+        # Names and namespaces are used as keys and compared over and over
+        # again when generating the documentation, so we intern them
+        self.name = name and sys.intern(name)
+        self.namespace = namespace and sys.intern(namespace)
         if self.namespace is None:
             if self.name is not None and '.' in self.name:
-                self.namespace = self.name.split('.')[0]
+                self.namespace = sys.intern(self.name.split('.')[0])
         self.info = Info()
 
     def set_introspectable(self, introspectable: bool) -> None:
@@ -521,7 +527,22 @@ class Field(GIRElement):
         self.bits = bits
 
 
-class Interface(Type):
+class MethodsMixin:
+    """Mixin for the types that have methods, to look them up by name"""
+    methods: T.List[Method]
+    _methods_by_name: T.Dict[str, Method]
+
+    def set_methods(self, methods: T.List[Method]) -> None:
+        self.methods.extend(methods)
+        for m in methods:
+            if m.name is not None:
+                self._methods_by_name.setdefault(m.name, m)
+
+    def find_method(self, name: str) -> T.Optional[Method]:
+        return self._methods_by_name.get(name)
+
+
+class Interface(Type, MethodsMixin):
     def __init__(self, name: str, namespace: str, ctype: str, symbol_prefix: str, gtype: GType):
         super().__init__(name=name, ctype=ctype, namespace=namespace)
         self.symbol_prefix = symbol_prefix
@@ -534,6 +555,7 @@ class Interface(Type):
         self.fields: T.List[Field] = []
         self.prerequisite: T.Optional[str] = None
         self.implementations: T.List[Type] = []
+        self._methods_by_name: T.Dict[str, Method] = {}
 
     @property
     def type_struct(self) -> T.Optional[str]:
@@ -545,9 +567,6 @@ class Interface(Type):
     def type_func(self) -> str:
         return self.gtype.get_type
 
-    def set_methods(self, methods: T.List[Method]) -> None:
-        self.methods.extend(methods)
-
     def set_virtual_methods(self, methods: T.List[VirtualMethod]) -> None:
         self.virtual_methods.extend(methods)
 
@@ -569,7 +588,7 @@ class Interface(Type):
         self.prerequisite = prerequisite
 
 
-class Class(Type):
+class Class(Type, MethodsMixin):
     def __init__(self, name: str, namespace: str, ctype: str, symbol_prefix: str,
                  gtype: GType, parent: T.Optional[Type] = None,
                  abstract: bool = False, fundamental: bool = False,
@@ -593,6 +612,7 @@ class Class(Type):
         self.fields: T.List[Field] = []
         self.callbacks: T.List[Callback] = []
         self.descendants: T.List[Type] = []
+        self._methods_by_name: T.Dict[str, Method] = {}
 
     @property
     def type_struct(self) -> T.Optional[str]:
@@ -609,9 +629,6 @@ class Class(Type):
     def set_constructors(self, ctors: T.List[Function]) -> None:
         self.constructors.extend(ctors)
 
-    def set_methods(self, methods: T.List[Method]) -> None:
-        self.methods.extend(methods)
-
     def set_virtual_methods(self, methods: T.List[VirtualMethod]) -> None:
         self.virtual_methods.extend(methods)
 
@@ -644,7 +661,7 @@ class Boxed(Type):
         self.functions.extend(functions)
 
 
-class Record(Type):
+class Record(Type, MethodsMixin):
     def __init__(self, name: str, namespace: str, ctype: str, symbol_prefix: str,
                  gtype: T.Optional[GType] = None, struct_for: T.Optional[str] = None,
                  disguised: bool = False):
@@ -655,6 +672,7 @@ class Record(Type):
         self.disguised = disguised
         self.constructors: T.List[Function] = []
         self.methods: T.List[Method] = []
+        self._methods_by_name: T.Dict[str, Method] = {}
         self.functions: T.List[Function] = []
         self.fields: T.List[Field] = []
 
@@ -673,9 +691,6 @@ class Record(Type):
     def set_constructors(self, ctors: T.List[Function]) -> None:
         self.constructors.extend(ctors)
 
-    def set_methods(self, methods: T.List[Method]) -> None:
-        self.methods.extend(methods)
-
     def set_functions(self, functions: T.List[Function]) -> None:
         self.functions.extend(functions)
 
@@ -683,13 +698,14 @@ class Record(Type):
         self.fields.extend(fields)
 
 
-class Union(Type):
+class Union(Type, MethodsMixin):
     def __init__(self, name: str, namespace: str, ctype: str, symbol_prefix: str, gtype: T.Optional[GType]):
         super().__init__(name=name, ctype=ctype, namespace=namespace)
         self.symbol_prefix = symbol_prefix
         self.gtype = gtype
         self.constructors: T.List[Function] = []
         self.methods: T.List[Method] = []
+        self._methods_by_name: T.Dict[str, Method] = {}
         self.functions: T.List[Function] = []
         self.fields: T.List[Field] = []
 
@@ -708,9 +724,6 @@ class Union(Type):
     def set_constructors(self, ctors: T.List[Function]) -> None:
         self.constructors.extend(ctors)
 
-    def set_methods(self, methods: T.List[Method]) -> None:
-        self.methods.extend(methods)
-
     def set_functions(self, functions: T.List[Function]) -> None:
         self.functions.extend(functions)
 
@@ -720,7 +733,7 @@ class Union(Type):
 
 class Namespace:
     def __init__(self, name: str, version: str, identifier_prefix: T.List[str] = [], symbol_prefix: T.List[str] = []):
-        self.name = name
+        self.name = sys.intern(name)
         self.version = version
 
         self._shared_libraries: T.List[str] = []
@@ -949,6 +962,9 @@ class Repository:
         self.types: T.Mapping[str, T.List[Type]] = {}
         self._namespaces: T.List[Namespace] = []
         self.girfile: T.Optional[str] = None
+        # Results of the find_* methods, keyed by method and arguments;
+        # the repository does not change once it has been resolved
+        self._lookup_cache: T.Dict[T.Tuple, T.Any] = {}
 
     def add_namespace(self, ns: Namespace) -> None:
         self._namespaces.append(ns)
@@ -1239,7 +1255,18 @@ class Repository:
     def namespace(self) -> T.Optional[Namespace]:
         return self._namespaces[0]
 
+    def _cached_lookup(self, lookup, *args):
+        key = (lookup.__name__, *args)
+        res = self._lookup_cache.get(key, _MISSING)
+        if res is _MISSING:
+            res = lookup(*args)
+            self._lookup_cache[key] = res
+        return res
+
     def find_type(self, name: str, ns: T.Optional[str] = None) -> T.Optional[T.Tuple[Namespace, Type]]:
+        return self._cached_lookup(self._find_type, name, ns)
+
+    def _find_type(self, name: str, ns: T.Optional[str] = None) -> T.Optional[T.Tuple[Namespace, Type]]:
         if ns is None or self.namespace.name == ns:
             res = self.namespace.find_real_type(name)
             if res is not None:
@@ -1253,6 +1280,9 @@ class Repository:
         return None
 
     def find_symbol(self, name: str) -> T.Optional[T.Tuple[Namespace, Type]]:
+        return self._cached_lookup(self._find_symbol, name)
+
+    def _find_symbol(self, name: str) -> T.Optional[T.Tuple[Namespace, Type]]:
         log.debug(f"Looking for symbol {name} in current namespace {self.namespace.name}")
         res = self.namespace.find_symbol(name)
         if res is not None:
@@ -1265,6 +1295,9 @@ class Repository:
         return None
 
     def find_class(self, name: str, ns: T.Optional[str] = None) -> T.Optional[T.Tuple[Namespace, Type]]:
+        return self._cached_lookup(self._find_class, name, ns)
+
+    def _find_class(self, name: str, ns: T.Optional[str] = None) -> T.Optional[T.Tuple[Namespace, Type]]:
         if ns is None or self.namespace.name == ns:
             res = self.namespace.find_class(name)
             if res is not None:
@@ -1278,6 +1311,9 @@ class Repository:
         return None
 
     def find_interface(self, name: str, ns: T.Optional[str] = None) -> T.Optional[T.Tuple[Namespace, Type]]:
+        return self._cached_lookup(self._find_interface, name, ns)
+
+    def _find_interface(self, name: str, ns: T.Optional[str] = None) -> T.Optional[T.Tuple[Namespace, Type]]:
         if ns is None or self.namespace.name == ns:
             res = self.namespace.find_interface(name)
             if res is not None:
@@ -1,11 +1,14 @@
 # SPDX-FileCopyrightText: 2020 GNOME Foundation
 # SPDX-License-Identifier: Apache-2.0 OR GPL-3.0-or-later
 
+import gc
+import hashlib
 import os
+import pickle
 import typing as T
 import xml.etree.ElementTree as ET
 
-from .. import log
+from .. import core, log
 from . import ast
 
 GI_NAMESPACES = {
@@ -55,6 +58,11 @@ FUNDAMENTAL_CTYPES = {
     'GObject.ParamSpec': 'GObject.ParamSpec*',
 }
 
+# Each cache entry holds a whole repository and all its dependencies, which
+# is several megabytes for anything that depends on GIO, so we only keep the
+# most recently used entries
+GIR_CACHE_MAX_ENTRIES = 4
+
 
 def _corens(tag: str) -> str:
     return f"{{{GI_NAMESPACES['core']}}}{tag}"
@@ -85,8 +93,117 @@ class GirParser:
         """Prepend a path to the list of search paths"""
         self._search_paths = [path] + self._search_paths
 
+    def _cache_entry(self, girfile: str) -> T.Optional[T.Tuple[str, T.Tuple]]:
+        if os.environ.get("GIDOCGEN_NO_CACHE"):
+            return None
+        try:
+            mtime = os.stat(girfile).st_mtime_ns
+        except OSError:
+            return None
+        cache_home = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+        # Each GIR file has a single cache entry, replaced every time the GIR
+        # file needs to be parsed again, so the cache does not grow each time
+        # a project rebuilds its introspection data
+        key = hashlib.blake2b(os.path.abspath(girfile).encode('utf-8')).hexdigest()
+        cache_file = os.path.join(cache_home, "gi-docgen", f"{key}.pkl")
+        # Cached repositories are pickled AST objects, so they are only valid
+        # for the same parser and AST; the version alone is not enough when
+        # running gi-docgen from a source checkout
+        code = tuple(os.stat(f).st_mtime_ns for f in (__file__, ast.__file__))
+        stamp = (mtime, tuple(self._search_paths), core.version, code)
+        return cache_file, stamp
+
+    def _load_cache(self, cache_file: str, stamp: T.Tuple) -> bool:
+        # Unpickling a whole repository creates a lot of objects, and none of
+        # them are garbage; running the cyclic collector while loading only
+        # wastes time; the caller may have already disabled it, though
+        gc_was_enabled = gc.isenabled()
+        try:
+            gc.disable()
+            with open(cache_file, "rb") as f:
+                # The stamp is stored ahead of the repository, so that we do
+                # not need to load a stale entry
+                if pickle.load(f) != stamp:
+                    log.debug(f"Ignoring stale GIR cache {cache_file}")
+                    return False
+                repository, dependencies, mtimes = pickle.load(f)
+            # The cache is only valid as long as none of the dependencies changed
+            for path, mtime in mtimes.items():
+                if os.stat(path).st_mtime_ns != mtime:
+                    return False
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            # Unpickling a damaged entry can fail in pretty much any way, but
+            # we can always parse the GIR file again
+            log.debug(f"Discarding unreadable GIR cache {cache_file}: {e!r}")
+            try:
+                os.unlink(cache_file)
+            except OSError:
+                pass
+            return False
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        log.debug(f"Loaded cached GIR from {cache_file}")
+        # Mark the entry as recently used, so that it is not pruned
+        try:
+            os.utime(cache_file)
+        except OSError:
+            pass
+        self._repository = repository
+        self._dependencies = dependencies
+        return True
+
+    def _save_cache(self, cache_file: str, stamp: T.Tuple) -> None:
+        tmp_file = f"{cache_file}.{os.getpid()}"
+        try:
+            mtimes = {r.girfile: os.stat(r.girfile).st_mtime_ns for r in self._dependencies.values()}
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(tmp_file, "wb") as f:
+                pickle.dump(stamp, f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump((self._repository, self._dependencies, mtimes), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except (OSError, pickle.PicklingError, RecursionError) as e:
+            # Do not leave a partially written entry behind
+            try:
+                os.unlink(tmp_file)
+            except OSError:
+                pass
+            log.debug(f"Could not save GIR cache {cache_file}: {e}")
+            return
+        self._prune_cache(os.path.dirname(cache_file))
+
+    def _prune_cache(self, cache_dir: str) -> None:
+        # Entries are touched every time they are loaded, so the ones with
+        # the oldest modification time are the least recently used
+        entries = []
+        try:
+            for entry in os.scandir(cache_dir):
+                if entry.name.endswith(".pkl"):
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+        except OSError:
+            return
+        entries.sort(reverse=True)
+        for _, path in entries[GIR_CACHE_MAX_ENTRIES:]:
+            log.debug(f"Pruning GIR cache {path}")
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
     def parse(self, girfile: T.Union[T.TextIO, str]) -> None:
         """Parse @girfile"""
+        if isinstance(girfile, str):
+            girfile_name = girfile
+        else:
+            girfile_name = getattr(girfile, 'name', '<stdin>')
+        cache_entry = None
+        if girfile_name != '<stdin>':
+            cache_entry = self._cache_entry(girfile_name)
+        if cache_entry is not None and self._load_cache(*cache_entry):
+            self._repository.girfile = girfile_name
+            return
         log.debug(f"Loading GIR for {girfile}")
         tree = ET.parse(girfile)
         repository = self._parse_tree(tree.getroot())
@@ -96,10 +213,7 @@ class GirParser:
             else:
                 raise RuntimeError(f"Invalid GIR file {girfile}")
         else:
-            if isinstance(girfile, str):
-                repository.girfile = girfile
-            else:
-                repository.girfile = girfile.name
+            repository.girfile = girfile_name
             self._repository = repository
             self._repository.resolve_empty_ctypes(self._seen_types)
             self._repository.resolve_class_ctype()
@@ -110,6 +224,8 @@ class GirParser:
             self._repository.resolve_interface_implementations()
             self._repository.resolve_moved_to()
             self._repository.resolve_symbols()
+            if cache_entry is not None:
+                self._save_cache(*cache_entry)
 
     def get_repository(self, name: T.Optional[str] = None) -> T.Optional[ast.Repository]:
         if name is None:
@@ -282,7 +398,7 @@ class GirParser:
         return node.attrib['name']
 
     def _maybe_parse_doc(self, node: ET.Element) -> T.Optional[ast.Doc]:
-        child = node.find('core:doc', GI_NAMESPACES)
+        child = node.find(_corens('doc'))
         if child is None:
             return None
 
@@ -291,21 +407,21 @@ class GirParser:
         return ast.Doc(content=content, filename=child.attrib['filename'], line=int(child.attrib['line']))
 
     def _maybe_parse_source_position(self, node: ET.Element) -> T.Optional[ast.SourcePosition]:
-        child = node.find('core:source-position', GI_NAMESPACES)
+        child = node.find(_corens('source-position'))
         if child is None:
             return None
 
         return ast.SourcePosition(filename=child.attrib['filename'], line=int(child.attrib['line']))
 
     def _maybe_parse_deprecated_doc(self, node: ET.Element) -> T.Optional[str]:
-        child = node.find('core:doc-deprecated', GI_NAMESPACES)
+        child = node.find(_corens('doc-deprecated'))
         if child is None:
             return None
 
         return "".join(child.itertext())
 
     def _maybe_parse_attributes(self, node: ET.Element) -> T.Optional[T.Mapping[str, str]]:
-        children = node.findall('core:attribute', GI_NAMESPACES)
+        children = node.findall(_corens('attribute'))
         if children is None:
             return None
 
@@ -337,7 +453,7 @@ class GirParser:
             element.set_deprecated(deprecated_doc, deprecated_since)
 
     def _parse_array(self, node: ET.Element) -> ast.Type:
-        child = node.find('core:array', GI_NAMESPACES)
+        child = node.find(_corens('array'))
 
         array_name = child.attrib.get('name')
         array_type = child.attrib.get(_cns('type'))
@@ -346,7 +462,7 @@ class GirParser:
         attr_length = child.attrib.get('length')
 
         target: T.Optional[ast.Type] = None
-        child_type = child.find('core:type', GI_NAMESPACES)
+        child_type = child.find(_corens('type'))
         if child_type is not None:
             ttype = child_type.attrib.get(_cns('type'))
             tname = child_type.attrib.get('name')
@@ -390,11 +506,11 @@ class GirParser:
     def _parse_ctype(self, node: ET.Element) -> ast.Type:
         ctype: T.Optional[ast.Type] = None
 
-        child = node.find('core:array', GI_NAMESPACES)
+        child = node.find(_corens('array'))
         if child is not None:
             return self._parse_array(node)
 
-        child = node.find('core:type', GI_NAMESPACES)
+        child = node.find(_corens('type'))
         if child is not None:
             ttype = child.attrib.get(_cns('type'))
             tname = child.attrib.get('name')
@@ -407,7 +523,7 @@ class GirParser:
             elif tname == 'none' and ttype == 'void':
                 ctype = None
             elif tname in ['GLib.List', 'GLib.SList']:
-                child_type = child.find('core:type', GI_NAMESPACES)
+                child_type = child.find(_corens('type'))
                 if child_type is not None:
                     etname = child_type.attrib.get('name', 'gpointer')
                     etype = self._lookup_type(name=etname)
@@ -415,7 +531,7 @@ class GirParser:
                 else:
                     ctype = self._lookup_type(name=tname, ctype=ttype)
             elif tname in ['GList.HashTable']:
-                child_types = child.findall('core:type', GI_NAMESPACES)
+                child_types = child.findall(_corens('type'))
                 if child_types is not None and len(child_types) == 2:
                     ktname = child_types[0].attrib.get('name', 'gpointer')
                     vtname = child_types[1].attrib.get('name', 'gpointer')
@@ -434,7 +550,7 @@ class GirParser:
             else:
                 ctype = self._lookup_type(name=tname, ctype=ttype)
         else:
-            child = node.find('core:varargs', GI_NAMESPACES)
+            child = node.find(_corens('varargs'))
             if child is not None:
                 ctype = ast.VarArgs()
 
@@ -444,7 +560,7 @@ class GirParser:
         return ctype
 
     def _parse_alias(self, node: ET.Element, repo: ast.Repository, ns: ast.Namespace) -> None:
-        child = node.find('core:type', GI_NAMESPACES)
+        child = node.find(_corens('type'))
         assert child is not None
 
         name = node.attrib.get('name')
@@ -464,10 +580,10 @@ class GirParser:
         ctype = node.attrib.get(_cns('type'))
         throws = node.attrib.get('throws', '0') == '1'
 
-        child = node.find('core:return-value', GI_NAMESPACES)
+        child = node.find(_corens('return-value'))
         return_value = self._parse_return_value(child)
 
-        children = node.findall('./core:parameters/core:parameter', GI_NAMESPACES)
+        children = node.findall(f"./{_corens('parameters')}/{_corens('parameter')}")
         params = []
         for child in children:
             params.append(self._parse_parameter(child))
@@ -485,10 +601,10 @@ class GirParser:
         ctype = node.attrib.get(_cns('type'))
         throws = node.attrib.get('throws', '0') == '1'
 
-        child = node.find('core:return-value', GI_NAMESPACES)
+        child = node.find(_corens('return-value'))
         return_value = self._parse_return_value(child)
 
-        children = node.findall('./core:parameters/core:parameter', GI_NAMESPACES)
+        children = node.findall(f"./{_corens('parameters')}/{_corens('parameter')}")
         params = []
         for child in children:
             params.append(self._parse_parameter(child))
@@ -502,7 +618,7 @@ class GirParser:
         ns.add_callback(res)
 
     def _parse_constant(self, node: ET.Element, repo: ast.Repository, ns: T.Optional[ast.Namespace]) -> None:
-        child = node.find('core:type', GI_NAMESPACES)
+        child = node.find(_corens('type'))
         assert child is not None
 
         name = node.attrib.get('name')
@@ -565,10 +681,10 @@ class GirParser:
         sync_func = node.attrib.get(_glibns('sync-func'))
         finish_func = node.attrib.get(_glibns('finish-func'))
 
-        child = node.find('core:return-value', GI_NAMESPACES)
+        child = node.find(_corens('return-value'))
         return_value = self._parse_return_value(child)
 
-        children = node.findall('./core:parameters/core:parameter', GI_NAMESPACES)
+        children = node.findall(f"./{_corens('parameters')}/{_corens('parameter')}")
         params = []
         for child in children:
             params.append(self._parse_parameter(child))
@@ -604,7 +720,7 @@ class GirParser:
         name = node.attrib.get('name')
         identifier = node.attrib.get(_cns('identifier'))
 
-        children = node.findall('./core:parameters/core:parameter', GI_NAMESPACES)
+        children = node.findall(f"./{_corens('parameters')}/{_corens('parameter')}")
         params = []
         for child in children:
             params.append(self._parse_parameter(child))
@@ -634,13 +750,13 @@ class GirParser:
         sync_func = node.attrib.get(_glibns('sync-func'))
         finish_func = node.attrib.get(_glibns('finish-func'))
 
-        child = node.find('core:return-value', GI_NAMESPACES)
+        child = node.find(_corens('return-value'))
         return_value = self._parse_return_value(child)
 
-        child = node.find('./core:parameters/core:instance-parameter', GI_NAMESPACES)
+        child = node.find(f"./{_corens('parameters')}/{_corens('instance-parameter')}")
         instance_param = self._parse_parameter(child, True)
 
-        children = node.findall('./core:parameters/core:parameter', GI_NAMESPACES)
+        children = node.findall(f"./{_corens('parameters')}/{_corens('parameter')}")
         params = []
         for child in children:
             params.append(self._parse_parameter(child))
@@ -665,13 +781,13 @@ class GirParser:
         invoker = node.attrib.get('invoker')
         throws = node.attrib.get('throws', '0') == '1'
 
-        child = node.find('core:return-value', GI_NAMESPACES)
+        child = node.find(_corens('return-value'))
         return_value = self._parse_return_value(child)
 
-        child = node.find('./core:parameters/core:instance-parameter', GI_NAMESPACES)
+        child = node.find(f"./{_corens('parameters')}/{_corens('instance-parameter')}")
         instance_param = self._parse_parameter(child, True)
 
-        children = node.findall('./core:parameters/core:parameter', GI_NAMESPACES)
+        children = node.findall(f"./{_corens('parameters')}/{_corens('parameter')}")
         params = []
         for child in children:
             params.append(self._parse_parameter(child))
@@ -696,7 +812,7 @@ class GirParser:
         return res
 
     def _parse_enumeration(self, node: ET.Element, repo: ast.Repository, ns: ast.Namespace) -> None:
-        children = node.findall('core:member', GI_NAMESPACES)
+        children = node.findall(_corens('member'))
         if children is None or len(children) == 0:
             return
 
@@ -704,7 +820,7 @@ class GirParser:
         for child in children:
             members.append(self._parse_enum_member(child))
 
-        children = node.findall('core:function', GI_NAMESPACES)
+        children = node.findall(_corens('function'))
         functions = []
         for child in children:
             functions.append(self._parse_type_function(child))
@@ -735,7 +851,7 @@ class GirParser:
         self._maybe_parse_docs(node, res)
 
     def _parse_bitfield(self, node: ET.Element, repo: ast.Repository, ns: ast.Namespace) -> None:
-        children = node.findall('core:member', GI_NAMESPACES)
+        children = node.findall(_corens('member'))
         if children is None or len(children) == 0:
             return
 
@@ -743,7 +859,7 @@ class GirParser:
         for child in children:
             members.append(self._parse_enum_member(child))
 
-        children = node.findall('core:function', GI_NAMESPACES)
+        children = node.findall(_corens('function'))
         functions = []
         for child in children:
             functions.append(self._parse_type_function(child))
@@ -795,12 +911,12 @@ class GirParser:
         no_hooks = node.attrib.get('no-hooks') == '1'
         no_recurse = node.attrib.get('no-recurse') == '1'
 
-        child = node.find('core:return-value', GI_NAMESPACES)
+        child = node.find(_corens('return-value'))
         return_value = None
         if child is not None:
             return_value = self._parse_return_value(child)
 
-        children = node.findall('./core:parameters/core:parameter', GI_NAMESPACES)
+        children = node.findall(f"./{_corens('parameters')}/{_corens('parameter')}")
         params = []
         for child in children:
             params.append(self._parse_parameter(child))
@@ -821,7 +937,7 @@ class GirParser:
         private = node.attrib.get('private', '0') == '1'
         bits = int(node.attrib.get('bits', '0'))
 
-        child = node.find('core:callback', GI_NAMESPACES)
+        child = node.find(_corens('callback'))
         if child is not None:
             ctype = self._parse_callback_field(child)
         else:
@@ -861,45 +977,45 @@ class GirParser:
             gtype = ast.GType(type_name=type_name, get_type=get_type, type_struct=type_struct)
 
         fields = []
-        children = node.findall('core:field', GI_NAMESPACES)
+        children = node.findall(_corens('field'))
         for child in children:
             fields.append(self._parse_field(child))
 
         ifaces = []
-        children = node.findall('core:implements', GI_NAMESPACES)
+        children = node.findall(_corens('implements'))
         for child in children:
             ifaces.append(self._parse_implements(child))
 
         ctors = []
-        children = node.findall('core:constructor', GI_NAMESPACES)
+        children = node.findall(_corens('constructor'))
         for child in children:
             ctors.append(self._parse_type_function(child))
 
         methods = []
-        children = node.findall('core:method', GI_NAMESPACES)
+        children = node.findall(_corens('method'))
         for child in children:
             methods.append(self._parse_method(child))
-        children = node.findall('core:method-inline', GI_NAMESPACES)
+        children = node.findall(_corens('method-inline'))
         for child in children:
             methods.append(self._parse_method(child, inline=True))
 
         vmethods = []
-        children = node.findall('core:virtual-method', GI_NAMESPACES)
+        children = node.findall(_corens('virtual-method'))
         for child in children:
             vmethods.append(self._parse_virtual_method(child))
 
         functions = []
-        children = node.findall('core:function', GI_NAMESPACES)
+        children = node.findall(_corens('function'))
         for child in children:
             functions.append(self._parse_type_function(child))
 
         properties = []
-        children = node.findall('core:property', GI_NAMESPACES)
+        children = node.findall(_corens('property'))
         for child in children:
             properties.append(self._parse_property(child))
 
         signals = []
-        children = node.findall('glib:signal', GI_NAMESPACES)
+        children = node.findall(_glibns('signal'))
         for child in children:
             signals.append(self._parse_signal(child))
 
@@ -933,37 +1049,37 @@ class GirParser:
             gtype = ast.GType(type_name=type_name, get_type=get_type, type_struct=type_struct)
 
         prerequisite = None
-        child = node.find('core:prerequisite', GI_NAMESPACES)
+        child = node.find(_corens('prerequisite'))
         if child is not None:
             prerequisite = self._lookup_type(name=child.attrib['name'])
 
         fields = []
-        children = node.findall('core:field', GI_NAMESPACES)
+        children = node.findall(_corens('field'))
         for child in children:
             fields.append(self._parse_field(child))
 
         methods = []
-        children = node.findall('core:method', GI_NAMESPACES)
+        children = node.findall(_corens('method'))
         for child in children:
             methods.append(self._parse_method(child))
 
         vmethods = []
-        children = node.findall('core:virtual-method', GI_NAMESPACES)
+        children = node.findall(_corens('virtual-method'))
         for child in children:
             vmethods.append(self._parse_virtual_method(child))
 
         functions = []
-        children = node.findall('core:function', GI_NAMESPACES)
+        children = node.findall(_corens('function'))
         for child in children:
             functions.append(self._parse_type_function(child))
 
         properties = []
-        children = node.findall('core:property', GI_NAMESPACES)
+        children = node.findall(_corens('property'))
         for child in children:
             properties.append(self._parse_property(child))
 
         signals = []
-        children = node.findall('glib:signal', GI_NAMESPACES)
+        children = node.findall(_glibns('signal'))
         for child in children:
             signals.append(self._parse_signal(child))
 
@@ -991,7 +1107,7 @@ class GirParser:
             gtype = ast.GType(type_name=type_name, get_type=get_type)
 
         functions = []
-        children = node.findall('core:function', GI_NAMESPACES)
+        children = node.findall(_corens('function'))
         for child in children:
             functions.append(self._parse_type_function(child))
 
@@ -1017,22 +1133,22 @@ class GirParser:
             gtype = ast.GType(type_name=type_name, get_type=get_type, type_struct=type_struct)
 
         fields = []
-        children = node.findall('core:field', GI_NAMESPACES)
+        children = node.findall(_corens('field'))
         for child in children:
             fields.append(self._parse_field(child))
 
         ctors = []
-        children = node.findall('core:constructor', GI_NAMESPACES)
+        children = node.findall(_corens('constructor'))
         for child in children:
             ctors.append(self._parse_type_function(child))
 
         methods = []
-        children = node.findall('core:method', GI_NAMESPACES)
+        children = node.findall(_corens('method'))
         for child in children:
             methods.append(self._parse_method(child))
 
         functions = []
-        children = node.findall('core:function', GI_NAMESPACES)
+        children = node.findall(_corens('function'))
         for child in children:
             functions.append(self._parse_type_function(child))
 
@@ -1061,22 +1177,22 @@ class GirParser:
             gtype = ast.GType(type_name=type_name, get_type=get_type, type_struct=type_struct)
 
         fields = []
-        children = node.findall('core:field', GI_NAMESPACES)
+        children = node.findall(_corens('field'))
         for child in children:
             fields.append(self._parse_field(child))
 
         ctors = []
-        children = node.findall('core:constructor', GI_NAMESPACES)
+        children = node.findall(_corens('constructor'))
         for child in children:
             ctors.append(self._parse_type_function(child))
 
         methods = []
-        children = node.findall('core:method', GI_NAMESPACES)
+        children = node.findall(_corens('method'))
         for child in children:
             methods.append(self._parse_method(child))
 
         functions = []
-        children = node.findall('core:function', GI_NAMESPACES)
+        children = node.findall(_corens('function'))
         for child in children:
             functions.append(self._parse_type_function(child))
 
@@ -138,6 +138,19 @@ def set_log_epoch(epoch=0):
         log_epoch = epoch
 
 
+def format_line(text, prefix=None, location=None):
+    '''
+    Formats a line of text using the given prefix and location.
+    '''
+    res = []
+    if prefix:
+        res += [str(prefix), ': ']
+    if location:
+        res += [str(location), ' ']
+    res += [text]
+    return ''.join(res)
+
+
 def log(text, prefix=None, location=None, out=None):
     '''
     Prints a line of text using the given prefix and location.
@@ -147,13 +160,7 @@ def log(text, prefix=None, location=None, out=None):
     @out: (optional): a File object
     '''
     with log_lock:
-        res = []
-        if prefix:
-            res += [str(prefix), ': ']
-        if location:
-            res += [str(location), ' ']
-        res += [text]
-        print(''.join(res), file=out)
+        print(format_line(text, prefix, location), file=out)
 
 
 def error(text, location=None):
@@ -173,6 +180,22 @@ def warning(text, location=None):
         sys.exit(1)
 
 
+def warnings(texts, location=None):
+    '''Prints a list of warning messages in one go'''
+    if log_fatal_warnings:
+        texts = texts[:1]
+
+    prefix = yellow('WARNING')
+    with log_lock:
+        print('\n'.join([format_line(text, prefix, location) for text in texts]), file=sys.stderr)
+
+    global log_warnings_counter
+    log_warnings_counter += len(texts)
+
+    if log_fatal_warnings:
+        sys.exit(1)
+
+
 def info(text, location=None):
     '''Prints an information message'''
     if not log_quiet:
@@ -1,11 +1,14 @@
 # SPDX-FileCopyrightText: 2021 GNOME Foundation
 # SPDX-License-Identifier: Apache-2.0 OR GPL-3.0-or-later
 
+import functools
 import markdown
 import os
 import re
 import subprocess
 import sys
+import threading
+import typing as T
 
 from markupsafe import Markup
 from pygments import highlight
@@ -112,6 +115,16 @@ METHOD_RE = re.compile(
     ''',
     re.VERBOSE)
 
+# A single line of text that Markdown would only wrap into a paragraph:
+# it does not start with a digit, which would make it a list item, and
+# it has no colons, which the meta extension would turn into metadata
+PLAIN_TEXT_RE = re.compile(
+    r'''
+    [A-Za-z][A-Za-z0-9,.;']*    # first word
+    (?:\ [A-Za-z0-9,.;']+)*     # other words, separated by a single space
+    ''',
+    re.VERBOSE)
+
 LANGUAGE_MAP = {
     'c': 'c',
     'css': 'css',
@@ -139,6 +152,31 @@ MD_EXTENSIONS_CONF = {
     'toc': {'permalink_class': 'md-anchor', 'permalink': ''},
 }
 
+# Creating a Markdown instance is expensive, as it has to load and set up
+# all the extensions; Markdown instances are not thread safe, though, so we
+# keep one per thread. Each conversion stores a new list in toc_tokens, so
+# callers can hold on to it after the instance is reused
+_md_local = threading.local()
+
+
+def get_markdown():
+    md = getattr(_md_local, 'md', None)
+    if md is None:
+        md = markdown.Markdown(extensions=MD_EXTENSIONS, extension_configs=MD_EXTENSIONS_CONF)
+        _md_local.md = md
+    return md
+
+
+# The same documentation is processed more than once, for instance when
+# a symbol appears in the index of its type and on its own page
+_docs_cache: T.Dict[T.Tuple[str, gir.Namespace, bool], Markup] = {}
+
+
+def clear_docs_cache():
+    """Drop the processed documentation, and the namespaces it refers to"""
+    _docs_cache.clear()
+
+
 EN_STOPWORDS = set("""
 a  and  are  as  at
 be  but  by
@@ -755,6 +793,15 @@ def preprocess_docs(text, namespace, summary=False, md=None, extensions=[], plai
                 text = ' '.join(words)
         return text
 
+    # Only the output of the shared Markdown instance can be cached; callers
+    # passing their own instance may want to inspect its state afterwards
+    cache_key = None
+    if md is None and len(extensions) == 0:
+        cache_key = (text, namespace, summary)
+        res = _docs_cache.get(cache_key)
+        if res is not None:
+            return res
+
     processed_text = []
 
     code_block_text = []
@@ -780,9 +827,8 @@ def preprocess_docs(text, namespace, summary=False, md=None, extensions=[], plai
                 processed_text.extend(code_block_text)
                 processed_text += ["```"]
             else:
-                lexer = get_lexer_by_name(code_block_language)
-                formatter = HtmlFormatter()
-                code_block = highlight("\n".join(code_block_text), lexer, formatter)
+                lexer = _get_code_lexer(code_block_language)
+                code_block = highlight("\n".join(code_block_text), lexer, _code_formatter)
                 processed_text += [""]
                 processed_text.extend(code_block.split("\n"))
                 processed_text += [""]
@@ -837,7 +883,17 @@ def preprocess_docs(text, namespace, summary=False, md=None, extensions=[], plai
     if last_line and not last_line.endswith((".", "?", "!", "```")):
         processed_text[-1] = ''.join([last_line, '.'])
 
-    if md is None:
+    if md is None and len(extensions) == 0:
+        md = get_markdown()
+
+    if len(extensions) == 0 and len(processed_text) == 1 and PLAIN_TEXT_RE.fullmatch(processed_text[0]):
+        # Most summaries are a single line of plain text, so we can skip
+        # the whole Markdown pipeline
+        text = f"<p>{processed_text[0]}</p>"
+        # Callers may inspect the state of their instance afterwards
+        if md is not None:
+            md.reset()
+    elif md is None:
         md_ext = extensions.copy()
         md_ext.extend(MD_EXTENSIONS)
         text = markdown.markdown("\n".join(processed_text),
@@ -846,13 +902,25 @@ def preprocess_docs(text, namespace, summary=False, md=None, extensions=[], plai
     else:
         text = md.reset().convert("\n".join(processed_text))
 
-    return Markup(typogrify(text, ignore_tags=['h1', 'h2', 'h3', 'h4']))
+    res = Markup(typogrify(text, ignore_tags=['h1', 'h2', 'h3', 'h4']))
+    if cache_key is not None:
+        _docs_cache[cache_key] = res
+
+    return res
+
+
+# Looking up a lexer goes through all the Pygments plugins, and the
+# formatter does not keep any state between calls, so both can be reused
+@functools.lru_cache(maxsize=None)
+def _get_code_lexer(language):
+    return get_lexer_by_name(language)
+
+
+_code_formatter = HtmlFormatter()
 
 
 def code_highlight(text, language='c'):
-    lexer = get_lexer_by_name(language)
-    formatter = HtmlFormatter()
-    return Markup(highlight(text, lexer, formatter))
+    return Markup(highlight(text, _get_code_lexer(language), _code_formatter))
 
 
 def render_dot(dot, output_format="svg"):
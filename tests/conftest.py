@@ -0,0 +1,20 @@
+# SPDX-FileCopyrightText: 2021 GNOME Foundation
+# SPDX-License-Identifier: Apache-2.0 OR GPL-3.0-or-later
+
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_cache():
+    """Do not read or write the user's gi-docgen cache while testing"""
+    # The fixture is session-wide, so that it also covers the repositories
+    # parsed in setUpClass()
+    old_no_cache = os.environ.get('GIDOCGEN_NO_CACHE')
+    os.environ['GIDOCGEN_NO_CACHE'] = "1"
+    yield
+    if old_no_cache is None:
+        del os.environ['GIDOCGEN_NO_CACHE']
+    else:
+        os.environ['GIDOCGEN_NO_CACHE'] = old_no_cache
@@ -36,3 +36,24 @@ class TestConfig(unittest.TestCase):
         self.assertFalse(conf.is_unstable("1.2"))
         self.assertTrue(conf.is_unstable("1.3"))
         self.assertTrue(conf.is_unstable("2.0"))
+
+    def test_load_cached(self):
+        conf_a = config.GIDocConfig("tests/data/config/gtk4.toml")
+        conf_b = config.GIDocConfig("tests/data/config/gtk4.toml")
+        self.assertIs(conf_a._config, conf_b._config)
+
+        conf_c = config.GIDocConfig("tests/data/config/libadwaita.toml")
+        self.assertIsNot(conf_a._config, conf_c._config)
+
+    def test_is_hidden(self):
+        conf = config.GIDocConfig("tests/data/config/objects.toml")
+        self.assertTrue(conf.is_hidden("Hidden"))
+        self.assertTrue(conf.is_hidden("PrivateData"))
+        self.assertFalse(conf.is_hidden("Widget"))
+        self.assertTrue(conf.is_hidden("Widget", "method", "private_method"))
+        self.assertFalse(conf.is_hidden("Widget", "method", "show"))
+        self.assertFalse(conf.is_hidden("Widget", "property", "private_method"))
+
+        # Repeated queries return the same answers
+        self.assertTrue(conf.is_hidden("Widget", "method", "private_method"))
+        self.assertFalse(conf.is_hidden("Widget", "method", "show"))
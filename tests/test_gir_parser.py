@@ -1,8 +1,13 @@
 # SPDX-FileCopyrightText: 2021 Emmanuele Bassi
 # SPDX-License-Identifier: Apache-2.0 OR GPL-3.0-or-later
 
+import contextlib
+import gc
 import os
+import pickle
+import tempfile
 import unittest
+from unittest import mock
 
 from gidocgen import gir, utils
 
@@ -42,3 +47,129 @@ class TestGir(unittest.TestCase):
                 del os.environ['GI_GIR_PATH']
             else:
                 os.environ['GI_GIR_PATH'] = old_gi_gir_path
+
+    @contextlib.contextmanager
+    def _temporary_cache(self):
+        """Enable the GIR cache inside a temporary directory"""
+
+        old_cache_home = os.environ.get('XDG_CACHE_HOME')
+        old_no_cache = os.environ.pop('GIDOCGEN_NO_CACHE', None)
+
+        with tempfile.TemporaryDirectory() as cache_home:
+            os.environ['XDG_CACHE_HOME'] = cache_home
+            try:
+                yield os.path.join(cache_home, "gi-docgen")
+            finally:
+                if old_cache_home is None:
+                    del os.environ['XDG_CACHE_HOME']
+                else:
+                    os.environ['XDG_CACHE_HOME'] = old_cache_home
+                if old_no_cache is not None:
+                    os.environ['GIDOCGEN_NO_CACHE'] = old_no_cache
+
+    def test_gir_cache(self):
+        """Check that a parsed GIR is loaded from the cache"""
+
+        with self._temporary_cache() as cache_dir:
+            paths = [os.path.join(os.getcwd(), "tests/data/gir")]
+            girfile = os.path.join(os.getcwd(), "tests/data/gir", "Regress-1.0.gir")
+
+            parser = gir.GirParser(search_paths=paths, error=False)
+            parser.parse(girfile)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            cached_parser = gir.GirParser(search_paths=paths, error=False)
+            cached_parser.parse(girfile)
+
+            repo = parser.get_repository()
+            cached_repo = cached_parser.get_repository()
+            self.assertIsNot(repo, cached_repo)
+            self.assertEqual(cached_repo.namespace.name, repo.namespace.name)
+            self.assertEqual(cached_repo.girfile, girfile)
+            self.assertEqual(len(cached_repo.namespace.get_classes()), len(repo.namespace.get_classes()))
+
+            # Loading from the cache leaves the garbage collector as it was
+            gc.disable()
+            try:
+                gir.GirParser(search_paths=paths, error=False).parse(girfile)
+                self.assertFalse(gc.isenabled())
+            finally:
+                gc.enable()
+
+            # A stale entry is replaced, instead of being left behind
+            other_paths = paths + [os.path.join(os.getcwd(), "tests/data")]
+            other_parser = gir.GirParser(search_paths=other_paths, error=False)
+            other_parser.parse(girfile)
+            self.assertIsNot(other_parser.get_repository(), cached_repo)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+    def test_gir_cache_damaged(self):
+        """Check that a damaged cache entry is parsed again"""
+
+        with self._temporary_cache() as cache_dir:
+            paths = [os.path.join(os.getcwd(), "tests/data/gir")]
+            girfile = os.path.join(os.getcwd(), "tests/data/gir", "Regress-1.0.gir")
+
+            parser = gir.GirParser(search_paths=paths, error=False)
+            parser.parse(girfile)
+            cache_file = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+
+            with open(cache_file, "rb") as f:
+                stamp = pickle.load(f)
+
+            # Keep the stamp, and replace the repository with garbage: bytes
+            # that are not a pickle, and a pickle that is not a repository
+            garbage = [
+                b"\x80\x04garbage" * 64,
+                pickle.dumps(42),
+            ]
+            for data in garbage:
+                with self.subTest(data=data[:16]):
+                    with open(cache_file, "wb") as f:
+                        pickle.dump(stamp, f)
+                        f.write(data)
+
+                    damaged_parser = gir.GirParser(search_paths=paths, error=False)
+                    damaged_parser.parse(girfile)
+
+                    repo = damaged_parser.get_repository()
+                    self.assertIsNotNone(repo)
+                    self.assertEqual(repo.namespace.name, "Regress")
+                    self.assertEqual(len(repo.namespace.get_classes()), len(parser.get_repository().namespace.get_classes()))
+
+    def test_gir_cache_pruned(self):
+        """Check that only the most recently used cache entries are kept"""
+
+        with self._temporary_cache() as cache_dir, mock.patch.object(gir.parser, 'GIR_CACHE_MAX_ENTRIES', 2):
+            paths = [os.path.join(os.getcwd(), "tests/data/gir")]
+            girfiles = [os.path.join(os.getcwd(), "tests/data/gir", f"{name}.gir")
+                        for name in ("Utility-1.0", "cairo-1.0", "Regress-1.0")]
+
+            # Each entry is older than the ones saved after it
+            for girfile in girfiles:
+                gir.GirParser(search_paths=paths, error=False).parse(girfile)
+                for cache_file in os.listdir(cache_dir):
+                    mtime = os.stat(os.path.join(cache_dir, cache_file)).st_mtime - 10
+                    os.utime(os.path.join(cache_dir, cache_file), (mtime, mtime))
+
+            parser = gir.GirParser(search_paths=paths, error=False)
+            expected = sorted(os.path.basename(parser._cache_entry(girfile)[0]) for girfile in girfiles[1:])
+            self.assertEqual(sorted(os.listdir(cache_dir)), expected)
+
+    def test_repository_lookups(self):
+        """Check that repeated lookups return the same results"""
+
+        paths = [os.path.join(os.getcwd(), "tests/data/gir")]
+        parser = gir.GirParser(search_paths=paths, error=False)
+        parser.parse(os.path.join(os.getcwd(), "tests/data/gir", "Regress-1.0.gir"))
+        repo = parser.get_repository()
+
+        res = repo.find_class("TestObj", "Regress")
+        self.assertIsNotNone(res)
+        self.assertEqual(res[1].name, "TestObj")
+        self.assertIs(repo.find_class("TestObj", "Regress"), res)
+
+        self.assertIsNone(repo.find_class("TestInterface", "Regress"))
+        self.assertIsNotNone(repo.find_interface("TestInterface", "Regress"))
+        self.assertIsNone(repo.find_symbol("regress_no_such_symbol"))
+        self.assertIsNone(repo.find_symbol("regress_no_such_symbol"))
@@ -6,6 +6,8 @@ import xml.etree.ElementTree as ET
 import os
 import unittest
 
+import markdown
+
 from gidocgen import gir, mdext, utils
 
 
@@ -168,6 +170,66 @@ class TestLinkGenerator(unittest.TestCase):
                                 do_raise=True)
 
 
+class TestPreprocessDocs(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        paths = []
+        paths.extend([os.path.join(os.getcwd(), "tests/data/gir")])
+        paths.extend(utils.default_search_paths())
+
+        parser = gir.GirParser(search_paths=paths, error=False)
+        parser.parse(os.path.join(os.getcwd(), "tests/data/gir", "GObject-2.0.gir"))
+
+        cls._repository = parser.get_repository()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._repository = None
+
+    def test_shared_markdown(self):
+        """
+        Test that the shared Markdown instance does not leak state.
+        """
+        text = "a [class@GObject.Object] instance\n\n## Details\n\nSome *text*"
+        namespace = self._repository.namespace
+
+        md = markdown.Markdown(extensions=utils.MD_EXTENSIONS, extension_configs=utils.MD_EXTENSIONS_CONF)
+        expected = utils.preprocess_docs(text, namespace, md=md)
+
+        # Drop the processed documentation before each call, so that both
+        # conversions go through the shared Markdown instance
+        for i in range(2):
+            utils.clear_docs_cache()
+            self.assertEqual(utils.preprocess_docs(text, namespace), expected)
+
+    def test_clear_docs_cache(self):
+        """
+        Test that clearing the documentation cache drops all the entries.
+        """
+        namespace = self._repository.namespace
+
+        utils.preprocess_docs("Some *text*", namespace)
+        self.assertNotEqual(len(utils._docs_cache), 0)
+
+        utils.clear_docs_cache()
+        self.assertEqual(len(utils._docs_cache), 0)
+
+    def test_plain_summary(self):
+        """
+        Test that plain text summaries match the Markdown output.
+        """
+        namespace = self._repository.namespace
+        texts = [
+            ("a plain summary", "<p>A plain summary.</p>"),
+            ("Since: 2.0", ""),
+            ("1. a list item", "<ol>\n<li>a list item.</li>\n</ol>"),
+        ]
+        for (text, html) in texts:
+            with self.subTest(text=text):
+                self.assertEqual(utils.preprocess_docs(text, namespace, summary=True), html)
+
+
 class TestGtkDocExtension(unittest.TestCase):
 
     def test_gtkdoc_sigils(self):